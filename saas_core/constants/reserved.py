@@ -9,6 +9,7 @@ Usage:
 """
 
 # Reserved subdomains that cannot be used by customers
+# (frozenset: membership tests in validate_subdomain are O(1))
 RESERVED_SUBDOMAINS = frozenset([
     # System and admin
     'admin',
@@ -77,7 +78,6 @@ RESERVED_SUBDOMAINS = frozenset([
 
     # Security and abuse prevention
     'abuse',
-    'admin',
     'hostmaster',
     'info',
     'mailer-daemon',
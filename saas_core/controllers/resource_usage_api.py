@@ -16,7 +16,7 @@ Endpoints:
 import json
 import logging
 import time
-from collections import defaultdict
+from collections import deque
 from functools import wraps
 from threading import Lock
 
@@ -33,42 +33,60 @@ API_KEY_PARAM = 'saas.resource_api_key'
 # Rate limiting configuration (T-146)
 RATE_LIMIT_REQUESTS = 100  # Max requests per window
 RATE_LIMIT_WINDOW = 60     # Window in seconds (1 minute)
+_RATE_LIMIT_HEADER = str(RATE_LIMIT_REQUESTS)
 
 
 class RateLimiter:
     """Simple in-memory rate limiter using sliding window."""
 
+    __slots__ = ('max_requests', 'window_seconds', 'requests', 'lock')
+
     def __init__(self, max_requests=RATE_LIMIT_REQUESTS, window_seconds=RATE_LIMIT_WINDOW):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = defaultdict(list)
+        self.requests = {}
         self.lock = Lock()
 
     def is_allowed(self, client_id):
-        """Check if request is allowed for client."""
+        """
+        Check if request is allowed for client.
+
+        Returns:
+            tuple: (allowed, remaining, reset_seconds)
+        """
         now = time.time()
         window_start = now - self.window_seconds
 
         with self.lock:
-            # Clean old requests
-            self.requests[client_id] = [
-                t for t in self.requests[client_id] if t > window_start
-            ]
+            # Clean old requests (no entry is created for unknown clients here)
+            timestamps = self.requests.get(client_id)
+            if timestamps is not None:
+                while timestamps and timestamps[0] <= window_start:
+                    timestamps.popleft()
+                if not timestamps:
+                    del self.requests[client_id]
+                    timestamps = None
 
             # Check limit
-            if len(self.requests[client_id]) >= self.max_requests:
-                return False, self.max_requests - len(self.requests[client_id])
+            count = len(timestamps) if timestamps else 0
+            if count >= self.max_requests:
+                # Oldest request is always at the left end of the deque
+                reset_seconds = int(timestamps[0] + self.window_seconds - now) if timestamps else 0
+                return False, self.max_requests - count, reset_seconds
 
             # Record request
-            self.requests[client_id].append(now)
-            remaining = self.max_requests - len(self.requests[client_id])
-            return True, remaining
+            if timestamps is None:
+                timestamps = self.requests[client_id] = deque()
+            timestamps.append(now)
+            remaining = self.max_requests - len(timestamps)
+            return True, remaining, 0
 
     def get_reset_time(self, client_id):
         """Get time until rate limit resets."""
-        if client_id in self.requests and self.requests[client_id]:
-            oldest = min(self.requests[client_id])
-            return int(oldest + self.window_seconds - time.time())
+        with self.lock:
+            timestamps = self.requests.get(client_id)
+            if timestamps:
+                return int(timestamps[0] + self.window_seconds - time.time())
         return 0
 
 
@@ -94,21 +112,21 @@ def rate_limit_required(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         # Use API key as client identifier (or IP if no key)
-        api_key = request.httprequest.headers.get('X-API-Key') or \
+        httprequest = request.httprequest
+        api_key = httprequest.headers.get('X-API-Key') or \
                   request.params.get('api_key')
-        client_id = api_key or request.httprequest.remote_addr
+        client_id = api_key or httprequest.remote_addr
 
-        allowed, remaining = _rate_limiter.is_allowed(client_id)
+        allowed, remaining, reset_time = _rate_limiter.is_allowed(client_id)
 
         if not allowed:
-            reset_time = _rate_limiter.get_reset_time(client_id)
             _logger.warning(f"Rate limit exceeded for client: {client_id[:16]}...")
             return json_response({
                 'error': 'Rate limit exceeded',
                 'message': f'Too many requests. Please wait {reset_time} seconds.',
                 'retry_after': reset_time,
             }, status=429, headers={
-                'X-RateLimit-Limit': str(RATE_LIMIT_REQUESTS),
+                'X-RateLimit-Limit': _RATE_LIMIT_HEADER,
                 'X-RateLimit-Remaining': '0',
                 'X-RateLimit-Reset': str(int(time.time()) + reset_time),
                 'Retry-After': str(reset_time),
@@ -116,9 +134,10 @@ def rate_limit_required(func):
 
         # Add rate limit headers to successful responses
         response = func(*args, **kwargs)
-        if hasattr(response, 'headers'):
-            response.headers['X-RateLimit-Limit'] = str(RATE_LIMIT_REQUESTS)
-            response.headers['X-RateLimit-Remaining'] = str(remaining)
+        if isinstance(response, Response):
+            headers = response.headers
+            headers['X-RateLimit-Limit'] = _RATE_LIMIT_HEADER
+            headers['X-RateLimit-Remaining'] = str(remaining)
         return response
     return wrapper
 
@@ -303,14 +322,21 @@ class ResourceUsageAPI(http.Controller):
 
             logs = UsageLog.search(domain, order='timestamp asc')
 
+            # Load the (few) distinct metric types once instead of per log row
+            metric_types = {
+                mt['id']: mt
+                for mt in logs.mapped('metric_type_id').read(['code', 'unit'])
+            }
+
             # Format history data
             history = []
             for log in logs:
+                metric_type = metric_types.get(log.metric_type_id.id)
                 history.append({
                     'timestamp': log.timestamp.isoformat() if log.timestamp else None,
-                    'metric': log.metric_type_id.code if log.metric_type_id else 'unknown',
+                    'metric': metric_type['code'] if metric_type else 'unknown',
                     'value': log.value,
-                    'unit': log.metric_type_id.unit if log.metric_type_id else None,
+                    'unit': metric_type['unit'] if metric_type else None,
                 })
 
             return json_response({
@@ -394,44 +420,59 @@ class ResourceUsageAPI(http.Controller):
         """
         try:
             Instance = request.env[ModelNames.INSTANCE].sudo()
-
-            # Count instances by state
-            states = {}
-            for state in ['draft', 'pending', 'running', 'stopped', 'suspended', 'terminated', 'error']:
-                states[state] = Instance.search_count([('state', '=', state)])
-
-            # Get running instances for resource calculation
-            running = Instance.search([('state', '=', 'running')])
-
-            # Aggregate resource usage
+            Instance.flush_model()
+
+            # Resource columns only exist when saas_monitoring is installed
+            if 'cpu_usage' in Instance._fields:
+                resource_columns = """
+                    count(*) FILTER (WHERE cpu_usage <> 0),
+                    coalesce(sum(cpu_usage), 0),
+                    coalesce(sum(memory_usage), 0),
+                    coalesce(sum(disk_usage), 0)
+                """
+            else:
+                resource_columns = "0, 0, 0, 0"
+
+            # Archived instances are left out, as search_count() would
+            active_filter = f"WHERE {Instance._active_name}" if Instance._active_name else ""
+
+            # Single pass over saas_instance: per (server, state) counts and
+            # resource sums, post-processed below
+            request.env.cr.execute(f"""
+                SELECT server_id, state, count(*), {resource_columns}
+                FROM {Instance._table}
+                {active_filter}
+                GROUP BY server_id, state
+            """)
+
+            states = dict.fromkeys(
+                ['draft', 'pending', 'running', 'stopped', 'suspended', 'terminated', 'error'], 0
+            )
+            running_by_server = {}
             total_cpu = 0.0
             total_memory = 0.0
             total_disk = 0.0
             instances_with_metrics = 0
 
-            for inst in running:
-                if hasattr(inst, 'cpu_usage') and inst.cpu_usage:
-                    total_cpu += inst.cpu_usage
-                    instances_with_metrics += 1
-                if hasattr(inst, 'memory_usage'):
-                    total_memory += inst.memory_usage or 0
-                if hasattr(inst, 'disk_usage'):
-                    total_disk += inst.disk_usage or 0
+            for server_id, state, count, with_cpu, cpu, memory, disk in request.env.cr.fetchall():
+                if state in states:
+                    states[state] += count
+                if state != 'running':
+                    continue
+                running_by_server[server_id] = count
+                instances_with_metrics += with_cpu
+                total_cpu += cpu
+                total_memory += memory
+                total_disk += disk
 
             # Get server info
             Server = request.env[ModelNames.SERVER].sudo()
-            servers = Server.search([])
-            server_info = []
-            for server in servers:
-                server_info.append({
-                    'id': server.id,
-                    'name': server.name,
-                    'state': server.state,
-                    'instance_count': Instance.search_count([
-                        ('server_id', '=', server.id),
-                        ('state', '=', 'running')
-                    ]),
-                })
+            server_info = [{
+                'id': server['id'],
+                'name': server['name'],
+                'state': server['state'],
+                'instance_count': running_by_server.get(server['id'], 0),
+            } for server in Server.search_read([], ['name', 'state'])]
 
             return json_response({
                 'success': True,
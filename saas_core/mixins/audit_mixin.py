@@ -52,13 +52,40 @@ class SaasAuditMixin(models.AbstractModel):
     @api.model_create_multi
     def create(self, vals_list):
         """Set created_by and created_date on record creation."""
+        now = fields.Datetime.now()
+        uid = self.env.user.id
         for vals in vals_list:
-            vals['created_by_id'] = self.env.user.id
-            vals['created_date'] = fields.Datetime.now()
+            vals['created_by_id'] = uid
+            vals['created_date'] = now
         return super().create(vals_list)
 
     def write(self, vals):
         """Set updated_by and updated_date on record modification."""
-        vals['updated_by_id'] = self.env.user.id
-        vals['updated_date'] = fields.Datetime.now()
+        if vals and self._audit_vals_change_records(vals):
+            vals['updated_by_id'] = self.env.user.id
+            vals['updated_date'] = fields.Datetime.now()
         return super().write(vals)
+
+    def _audit_vals_change_records(self, vals):
+        """
+        Check whether writing vals would change any stored value of self.
+
+        Only single-record writes are compared, which costs at most the one
+        fetch of the record; writes on several records are always treated
+        as changes. Relational commands and non-stored fields are treated
+        as changes too; only plain values are compared with the current ones.
+        """
+        if len(self) != 1:
+            return True
+        for fname, value in vals.items():
+            field = self._fields.get(fname)
+            if field is None or not field.store or field.type in ('one2many', 'many2many'):
+                return True
+            try:
+                new_value = field.convert_to_cache(value, self, validate=False)
+                old_value = field.convert_to_cache(self[fname], self, validate=False)
+            except (TypeError, ValueError):
+                return True
+            if new_value != old_value:
+                return True
+        return False
@@ -17,16 +17,29 @@ Usage:
 """
 
 import logging
+import re
+
 from odoo import models, fields, api
 from odoo.addons.saas_core.utils.encryption import (
-    encrypt_value,
     decrypt_value,
+    encrypt_batch,
+    decrypt_batch,
+    gather_values,
+    scatter_values,
     is_encrypted,
     hash_for_search,
+    ENCRYPTED_PREFIX,
+    _ENC_PREFIX_LEN,
 )
 
 _logger = logging.getLogger(__name__)
 
+# Rows encrypted per UPDATE statement in action_encrypt_existing_data
+ENCRYPT_EXISTING_CHUNK_SIZE = 1000
+
+# Column names interpolated into SQL must be plain PostgreSQL identifiers
+_SQL_IDENTIFIER = re.compile(r'^[a-z_][a-z0-9_]{0,62}$')
+
 
 class SaasEncryptionMixin(models.AbstractModel):
     """
@@ -46,6 +59,30 @@ class SaasEncryptionMixin(models.AbstractModel):
     # Override in inheriting models
     _encrypted_fields = []
 
+    def _register_hook(self):
+        """Precompute the encrypted field lookups once the registry is ready."""
+        self._get_encrypted_fields()
+        return super()._register_hook()
+
+    def _get_encrypted_fields(self):
+        """
+        Get the encrypted field names, memoized on the model class.
+
+        Also sets ``_encrypted_fields_set`` (frozenset) for O(1) membership
+        tests. Registry classes are rebuilt on reload, so the memo follows
+        the current ``_encrypted_fields`` definition.
+
+        Returns:
+            tuple: Encrypted field names in declaration order
+        """
+        cls = type(self)
+        names = cls.__dict__.get('_encrypted_fields_tuple')
+        if names is None:
+            names = tuple(getattr(cls, '_encrypted_fields', ()))
+            cls._encrypted_fields_tuple = names
+            cls._encrypted_fields_set = frozenset(names)
+        return names
+
     def _encrypt_vals(self, vals):
         """
         Encrypt field values in a vals dictionary.
@@ -56,17 +93,25 @@ class SaasEncryptionMixin(models.AbstractModel):
         Returns:
             dict: Vals with encrypted values
         """
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
         if not encrypted_fields:
             return vals
 
-        encrypted_vals = dict(vals)
+        # Only touch vals that carry a plaintext value for an encrypted field;
+        # unrelated writes are returned as-is without copying
+        touched = []
         for field_name in encrypted_fields:
-            if field_name in encrypted_vals and encrypted_vals[field_name]:
-                value = encrypted_vals[field_name]
-                # Don't re-encrypt already encrypted values
-                if not is_encrypted(value):
-                    encrypted_vals[field_name] = encrypt_value(self.env, value)
+            value = vals.get(field_name)
+            # Don't re-encrypt already encrypted values
+            if value and not (type(value) is str and value[:_ENC_PREFIX_LEN] == ENCRYPTED_PREFIX):
+                touched.append(field_name)
+        if not touched:
+            return vals
+
+        encrypted_vals = dict(vals)
+        encrypted = encrypt_batch(self.env, [vals[field_name] for field_name in touched])
+        for field_name, value in zip(touched, encrypted):
+            encrypted_vals[field_name] = value
 
         return encrypted_vals
 
@@ -80,65 +125,91 @@ class SaasEncryptionMixin(models.AbstractModel):
         Returns:
             dict: Record with decrypted values
         """
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
         if not encrypted_fields:
             return record_vals
 
-        for field_name in encrypted_fields:
-            if field_name in record_vals and record_vals[field_name]:
-                value = record_vals[field_name]
-                if is_encrypted(value):
-                    record_vals[field_name] = decrypt_value(self.env, value)
+        for field_name in record_vals.keys() & self._encrypted_fields_set:
+            value = record_vals[field_name]
+            if type(value) is str and value[:_ENC_PREFIX_LEN] == ENCRYPTED_PREFIX:
+                record_vals[field_name] = decrypt_value(self.env, value)
 
         return record_vals
 
+    def _decrypt_records_vals(self, records_vals, field_names):
+        """
+        Decrypt field values in a list of record dictionaries in one batch.
+
+        Args:
+            records_vals: List of dictionaries from read()
+            field_names: Encrypted field names to decrypt
+
+        Returns:
+            list: The same list, with decrypted values
+        """
+        targets, values = gather_values(records_vals, field_names, encrypted=True)
+        if values:
+            scatter_values(targets, decrypt_batch(self.env, values))
+        return records_vals
+
     @api.model_create_multi
     def create(self, vals_list):
         """Encrypt PII fields before creating records."""
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
         if encrypted_fields and not self.env.context.get('skip_encryption'):
-            vals_list = [self._encrypt_vals(vals) for vals in vals_list]
+            # Gather all values to encrypt across the batch, encrypt them in
+            # one call and scatter the results back into copies of only the
+            # vals that carry plaintext; the others are passed through as-is
+            targets, values = gather_values(vals_list, encrypted_fields, encrypted=False)
+            if values:
+                copies = {id(vals): dict(vals) for vals, _field_name in targets}
+                vals_list = [copies.get(id(vals), vals) for vals in vals_list]
+                scatter_values(
+                    [(copies[id(vals)], field_name) for vals, field_name in targets],
+                    encrypt_batch(self.env, values),
+                )
         return super().create(vals_list)
 
     def write(self, vals):
         """Encrypt PII fields before writing records."""
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
         if encrypted_fields and not self.env.context.get('skip_encryption'):
             vals = self._encrypt_vals(vals)
         return super().write(vals)
 
     def read(self, fields=None, load='_classic_read'):
         """Decrypt PII fields when reading records."""
-        result = super().read(fields, load)
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
+        # Zero-overhead path for reads that don't touch encrypted fields
+        if not encrypted_fields or (fields and self._encrypted_fields_set.isdisjoint(fields)):
+            return super().read(fields, load)
 
-        if encrypted_fields:
-            # Determine which encrypted fields are being read
-            fields_to_decrypt = encrypted_fields
-            if fields:
-                fields_to_decrypt = [f for f in encrypted_fields if f in fields]
+        result = super().read(fields, load)
 
-            if fields_to_decrypt:
-                for record_vals in result:
-                    self._decrypt_record_vals(record_vals)
+        # Determine which encrypted fields are being read
+        fields_to_decrypt = encrypted_fields
+        if fields:
+            fields_to_decrypt = [f for f in encrypted_fields if f in fields]
+        self._decrypt_records_vals(result, fields_to_decrypt)
 
         return result
 
     @api.model
     def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None):
         """Decrypt PII fields in search_read results."""
+        encrypted_fields = self._get_encrypted_fields()
+        # Zero-overhead path for reads that don't touch encrypted fields
+        if not encrypted_fields or (fields and self._encrypted_fields_set.isdisjoint(fields)):
+            return super().search_read(domain, fields, offset, limit, order)
+
         result = super().search_read(domain, fields, offset, limit, order)
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
 
-        if encrypted_fields and result:
+        if result:
             # Determine which encrypted fields are being read
             fields_to_decrypt = encrypted_fields
             if fields:
                 fields_to_decrypt = [f for f in encrypted_fields if f in fields]
-
-            if fields_to_decrypt:
-                for record_vals in result:
-                    self._decrypt_record_vals(record_vals)
+            self._decrypt_records_vals(result, fields_to_decrypt)
 
         return result
 
@@ -160,31 +231,114 @@ class SaasEncryptionMixin(models.AbstractModel):
             return decrypt_value(self.env, raw_value)
         return raw_value
 
+    def _get_decrypted_values(self, field_names):
+        """
+        Get decrypted values of several fields for all records at once.
+
+        Reads the raw values in one query and decrypts them in one batch,
+        instead of one read and one decryption per record and field.
+
+        Args:
+            field_names: Names of the encrypted fields
+
+        Returns:
+            dict: {record id: {field name: decrypted value}}
+        """
+        if not self:
+            return {}
+        rows = super(SaasEncryptionMixin, self).read(field_names)
+        self._decrypt_records_vals(rows, field_names)
+        return {row.pop('id'): row for row in rows}
+
+    def _get_encrypted_columns(self):
+        """
+        Get the database columns backing the encrypted fields.
+
+        Only stored fields with a plain identifier name are returned, so the
+        names can be safely interpolated into SQL.
+
+        Returns:
+            list: Column names
+        """
+        columns = []
+        for field_name in self._get_encrypted_fields():
+            field = self._fields.get(field_name)
+            if not field or not field.store or not field.column_type:
+                continue
+            if field.column_type[0] not in ('varchar', 'text'):
+                continue
+            if not _SQL_IDENTIFIER.match(field_name):
+                _logger.warning(f"Skipping encrypted field with invalid column name: {field_name!r}")
+                continue
+            columns.append(field_name)
+        return columns
+
     def action_encrypt_existing_data(self):
         """
         Encrypt existing unencrypted data in the database.
 
         Call this method after enabling encryption on existing records.
+
+        Rows are updated in chunks with raw SQL rather than write(): only
+        the storage format changes, the values read through the ORM stay
+        the same. Skipping write() therefore also skips audit stamps and
+        tracking on purpose, as they would report a change on every record
+        that no user made. write_uid/write_date are still updated.
         """
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
         if not encrypted_fields:
             return {'status': 'no_fields', 'message': 'No encrypted fields defined'}
 
+        columns = self._get_encrypted_columns()
+        if not columns:
+            return {'status': 'success', 'encrypted_count': 0}
+
+        # Let PostgreSQL skip rows whose values are all empty or already
+        # encrypted, and page through the rest by id in chunks
+        self.flush_model(columns)
+        select_query = "SELECT id, {cols} FROM {table} WHERE id > %s AND ({condition}) ORDER BY id LIMIT %s".format(
+            cols=', '.join(columns),
+            table=self._table,
+            condition=' OR '.join(
+                f"({col} <> '' AND {col} NOT LIKE 'ENC::%%')" for col in columns
+            ),
+        )
+        assignments = [f"{col} = data.{col}" for col in columns]
+        touched = list(columns)
+        if self._log_access:
+            assignments += ["write_uid = %s", "write_date = (now() at time zone 'UTC')"]
+            touched += ['write_uid', 'write_date']
+        update_query = "UPDATE {table} SET {assignments} FROM (VALUES {{values}}) AS data(id, {cols}) WHERE {table}.id = data.id".format(
+            table=self._table,
+            assignments=', '.join(assignments),
+            cols=', '.join(columns),
+        )
+        row_placeholder = '(%s' + ', %s' * len(columns) + ')'
+
         count = 0
-        for record in self.search([]):
-            vals_to_update = {}
-            for field_name in encrypted_fields:
-                # Read raw value from database
-                raw_vals = super(SaasEncryptionMixin, record).read([field_name])
-                if raw_vals:
-                    raw_value = raw_vals[0].get(field_name)
-                    if raw_value and not is_encrypted(raw_value):
-                        vals_to_update[field_name] = encrypt_value(self.env, raw_value)
-
-            if vals_to_update:
-                # Write with context to skip re-encryption (already encrypted)
-                record.with_context(skip_encryption=True).write(vals_to_update)
-                count += 1
+        last_id = 0
+        while True:
+            self.env.cr.execute(select_query, (last_id, ENCRYPT_EXISTING_CHUNK_SIZE))
+            rows = self.env.cr.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            # encrypt_batch leaves empty and already encrypted values untouched
+            encrypted = iter(encrypt_batch(
+                self.env, [value for row in rows for value in row[1:]]
+            ))
+            params = [self.env.uid] if self._log_access else []
+            for row in rows:
+                params.append(row[0])
+                params.extend(next(encrypted) for _col in columns)
+
+            self.env.cr.execute(
+                update_query.format(values=', '.join([row_placeholder] * len(rows))),
+                params,
+            )
+            self.invalidate_model(touched)
+            count += len(rows)
 
         _logger.info(f"Encrypted {count} records in {self._name}")
         return {'status': 'success', 'encrypted_count': count}
@@ -196,7 +350,7 @@ class SaasEncryptionMixin(models.AbstractModel):
         Returns:
             dict: Status information
         """
-        encrypted_fields = getattr(self, '_encrypted_fields', [])
+        encrypted_fields = self._get_encrypted_fields()
         if not encrypted_fields:
             return {
                 'model': self._name,
@@ -206,29 +360,31 @@ class SaasEncryptionMixin(models.AbstractModel):
                 'unencrypted_records': 0,
             }
 
-        total = self.search_count([])
-        encrypted_count = 0
-        unencrypted_count = 0
-
-        for record in self.search([]):
-            is_record_encrypted = False
-            for field_name in encrypted_fields:
-                raw_vals = super(SaasEncryptionMixin, record).read([field_name])
-                if raw_vals:
-                    raw_value = raw_vals[0].get(field_name)
-                    if raw_value and is_encrypted(raw_value):
-                        is_record_encrypted = True
-                        break
-
-            if is_record_encrypted:
-                encrypted_count += 1
-            else:
-                unencrypted_count += 1
+        columns = self._get_encrypted_columns()
+        if columns:
+            # A record counts as encrypted if any of its columns carries the
+            # prefix; archived records are left out, as search_count() would
+            active_filter = ''
+            if self._active_name and self.env.context.get('active_test', True):
+                active_filter = f'WHERE {self._active_name}'
+                self.flush_model([self._active_name])
+            self.flush_model(columns)
+            self.env.cr.execute(
+                "SELECT count(*), count(*) FILTER (WHERE {condition}) FROM {table} {active_filter}".format(
+                    table=self._table,
+                    condition=' OR '.join(f"{col} LIKE 'ENC::%'" for col in columns),
+                    active_filter=active_filter,
+                )
+            )
+            total, encrypted_count = self.env.cr.fetchone()
+        else:
+            total = self.search_count([])
+            encrypted_count = 0
 
         return {
             'model': self._name,
-            'encrypted_fields': encrypted_fields,
+            'encrypted_fields': list(encrypted_fields),
             'total_records': total,
             'encrypted_records': encrypted_count,
-            'unencrypted_records': unencrypted_count,
+            'unencrypted_records': total - encrypted_count,
         }
@@ -9,3 +9,5 @@ AbstractModels must be imported in this context to be registered in ir.model.
 # Import mixins here to ensure they're registered as Odoo models
 from odoo.addons.saas_core.mixins.audit_mixin import SaasAuditMixin
 from odoo.addons.saas_core.mixins.encryption_mixin import SaasEncryptionMixin
+
+from . import ir_config_parameter
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Config parameter extension.
+
+Keeps the process-local parameter cache of the secure SSH utilities and
+the PII key material cache in sync with modifications of
+ir.config_parameter. The caches are cleared right away, for reads of
+the modifying transaction, and again once it is committed or rolled
+back, dropping whatever a concurrent read cached in between. Other
+workers are not notified: they keep serving the old value until their
+entries expire (_PARAM_CACHE_TTL, _KEY_MATERIAL_TTL).
+"""
+
+from odoo import models, api
+
+from odoo.addons.saas_core.utils.encryption import clear_key_material_cache
+from odoo.addons.saas_core.utils.secure_ssh import clear_param_cache
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    def _clear_saas_caches(self):
+        """Clear this database's process-local caches, now and at transaction end."""
+        dbname = self.env.cr.dbname
+        clear_param_cache(dbname)
+        clear_key_material_cache(dbname)
+
+        cr = self.env.cr
+        if cr.postcommit.data.get('saas_core.clear_param_caches'):
+            return
+        cr.postcommit.data['saas_core.clear_param_caches'] = True
+
+        def clear_caches():
+            clear_param_cache(dbname)
+            clear_key_material_cache(dbname)
+
+        cr.postcommit.add(clear_caches)
+        cr.postrollback.add(clear_caches)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self._clear_saas_caches()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self._clear_saas_caches()
+        return super().write(vals)
+
+    def unlink(self):
+        self._clear_saas_caches()
+        return super().unlink()
@@ -27,6 +27,8 @@ from .db_utils import (
 
 from .secure_ssh import (
     SecureSSHClient,
+    SSHConnectionPool,
+    ssh_pool,
     validate_identifier,
     validate_database_name,
     validate_container_name,
@@ -37,11 +39,20 @@ from .secure_ssh import (
     build_docker_exec_command,
     safe_remote_execute,
     ValidationError,
+    ValidatedIdentifier,
+    ValidatedDatabaseName,
+    ValidatedContainerName,
 )
 
 from .encryption import (
     encrypt_value,
     decrypt_value,
+    encrypt_batch,
+    decrypt_batch,
+    encrypt_value_b,
+    decrypt_value_b,
+    gather_values,
+    scatter_values,
     is_encrypted,
     hash_for_search,
     get_key_info,
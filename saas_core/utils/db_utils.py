@@ -6,12 +6,15 @@ Provides locking mechanisms, retry logic, and savepoint management
 for robust database operations.
 """
 
+import hashlib
 import logging
+import random
+import select
 import time
 import functools
 from contextlib import contextmanager
 
-from odoo import api, SUPERUSER_ID
+from odoo import api, SUPERUSER_ID, sql_db
 from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
@@ -20,15 +23,20 @@ _logger = logging.getLogger(__name__)
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_RETRY_DELAY = 2  # seconds
 DEFAULT_LOCK_TIMEOUT = 300  # 5 minutes
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_MAX_DELAY = 30.0  # seconds
 
-# Valid savepoint name pattern (PostgreSQL identifier rules)
+# Valid savepoint name pattern (PostgreSQL identifier rules, max 63 chars)
 import re
-SAVEPOINT_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+SAVEPOINT_NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,62}')
 
 
 def validate_savepoint_name(name: str) -> str:
     """
-    Validate and sanitize a savepoint name to prevent SQL injection.
+    Validate a savepoint name to prevent SQL injection.
+
+    Names are never rewritten: anything that is not a plain PostgreSQL
+    identifier of at most 63 characters is rejected.
 
     Args:
         name: Proposed savepoint name
@@ -42,22 +50,54 @@ def validate_savepoint_name(name: str) -> str:
     if not name:
         raise ValueError("Savepoint name cannot be empty")
 
-    # Convert to string and strip
-    name = str(name).strip()
+    name = str(name)
+    if not SAVEPOINT_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Invalid savepoint name: {name!r}")
 
-    # Limit length (PostgreSQL limit is 63 chars for identifiers)
-    if len(name) > 63:
-        name = name[:63]
+    return name
 
-    # Check pattern
-    if not SAVEPOINT_NAME_PATTERN.match(name):
-        # Sanitize: replace invalid chars with underscores
-        name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-        # Ensure starts with letter or underscore
-        if name[0].isdigit():
-            name = 'sp_' + name
 
-    return name
+@functools.lru_cache(maxsize=256)
+def _savepoint_queries(savepoint_name):
+    """
+    Return the (SAVEPOINT, RELEASE, ROLLBACK TO) statements for a validated name.
+
+    Memoized, so fixed names passed to savepoint() are only formatted once.
+    """
+    return (
+        f"SAVEPOINT {savepoint_name}",
+        f"RELEASE SAVEPOINT {savepoint_name}",
+        f"ROLLBACK TO SAVEPOINT {savepoint_name}",
+    )
+
+
+def _retry_delay(attempt, delay, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_delay=DEFAULT_MAX_DELAY, jitter=True):
+    """
+    Compute the sleep time before retrying after a failed attempt.
+
+    Exponential backoff capped at max_delay, with optional jitter in
+    [0.5, 1.5) to keep concurrent workers from retrying in lockstep.
+
+    Args:
+        attempt: Zero-based index of the failed attempt
+        delay: Base delay in seconds
+    """
+    wait = min(max_delay, delay * (backoff_factor ** attempt))
+    if jitter:
+        wait *= 0.5 + random.random()
+    return wait
+
+
+def lock_name_to_id(name):
+    """
+    Convert a lock name to a stable 63-bit advisory lock ID.
+
+    Python's hash() is randomized per process, so it cannot be used for
+    locks shared between workers.
+    """
+    digest = hashlib.blake2b(str(name).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & ((1 << 63) - 1)
 
 
 class DatabaseLock:
@@ -87,24 +127,37 @@ class DatabaseLock:
 
     def _name_to_id(self, name):
         """Convert lock name to a consistent integer ID."""
-        # Use hash to get a consistent integer from the name
-        return hash(name) % (2**31)
+        return lock_name_to_id(name)
 
     def acquire(self):
-        """Try to acquire the advisory lock."""
+        """
+        Try to acquire the advisory lock, waiting at most self.timeout seconds.
+
+        Polls pg_try_advisory_lock with exponential backoff instead of a
+        blocking pg_advisory_lock, whose wait is not bounded by lock_timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        backoff = 0.05
         try:
-            # Set statement timeout for lock acquisition
-            # Use parameterized query format for timeout
-            self.cr.execute("SET LOCAL lock_timeout = %s", [f'{self.timeout}s'])
+            while True:
+                self.cr.execute(
+                    "SELECT pg_try_advisory_lock(%s::bigint)",
+                    [self.lock_id]
+                )
+                if self.cr.fetchone()[0]:
+                    self.acquired = True
+                    _logger.debug(f"Lock acquired: {self.lock_name} (id={self.lock_id})")
+                    return True
 
-            # Try to acquire advisory lock (blocking)
-            self.cr.execute(
-                "SELECT pg_advisory_lock(%s)",
-                [self.lock_id]
-            )
-            self.acquired = True
-            _logger.debug(f"Lock acquired: {self.lock_name} (id={self.lock_id})")
-            return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    _logger.warning(
+                        f"Failed to acquire lock {self.lock_name}: "
+                        f"timeout after {self.timeout}s"
+                    )
+                    return False
+                time.sleep(min(backoff, remaining))
+                backoff = min(backoff * 2, 1.0)
         except Exception as e:
             _logger.warning(f"Failed to acquire lock {self.lock_name}: {e}")
             return False
@@ -114,7 +167,7 @@ class DatabaseLock:
         if self.acquired:
             try:
                 self.cr.execute(
-                    "SELECT pg_advisory_unlock(%s)",
+                    "SELECT pg_advisory_unlock(%s::bigint)",
                     [self.lock_id]
                 )
                 self.acquired = False
@@ -148,14 +201,14 @@ class TryLock:
     def __init__(self, cr, lock_name):
         self.cr = cr
         self.lock_name = lock_name
-        self.lock_id = hash(lock_name) % (2**31)
+        self.lock_id = lock_name_to_id(lock_name)
         self.acquired = False
 
     def try_acquire(self):
         """Try to acquire lock without blocking."""
         try:
             self.cr.execute(
-                "SELECT pg_try_advisory_lock(%s)",
+                "SELECT pg_try_advisory_lock(%s::bigint)",
                 [self.lock_id]
             )
             result = self.cr.fetchone()
@@ -171,7 +224,7 @@ class TryLock:
         if self.acquired:
             try:
                 self.cr.execute(
-                    "SELECT pg_advisory_unlock(%s)",
+                    "SELECT pg_advisory_unlock(%s::bigint)",
                     [self.lock_id]
                 )
                 self.acquired = False
@@ -202,27 +255,34 @@ def savepoint(cr, name=None):
     raw_name = name or f"sp_{int(time.time() * 1000)}"
     savepoint_name = validate_savepoint_name(raw_name)
 
+    # Use string formatting only with validated identifier
+    # PostgreSQL doesn't support parameterized savepoint names
+    create_sql, release_sql, rollback_sql = _savepoint_queries(savepoint_name)
+
     try:
-        # Use string formatting only with validated identifier
-        # PostgreSQL doesn't support parameterized savepoint names
-        cr.execute(f"SAVEPOINT {savepoint_name}")
+        cr.execute(create_sql)
         yield
-        cr.execute(f"RELEASE SAVEPOINT {savepoint_name}")
+        cr.execute(release_sql)
     except Exception:
-        cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint_name}")
+        cr.execute(rollback_sql)
         raise
 
 
 def retry_on_error(max_retries=DEFAULT_MAX_RETRIES, delay=DEFAULT_RETRY_DELAY,
-                   exceptions=(Exception,), on_retry=None):
+                   exceptions=(Exception,), on_retry=None,
+                   backoff_factor=DEFAULT_BACKOFF_FACTOR, max_delay=DEFAULT_MAX_DELAY,
+                   jitter=True):
     """
     Decorator to retry a function on failure.
 
     Args:
         max_retries: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        delay: Base delay between retries in seconds
         exceptions: Tuple of exception types to catch
         on_retry: Callback function(attempt, exception) called before retry
+        backoff_factor: Multiplier applied to the delay after each attempt
+        max_delay: Upper bound for a single delay in seconds
+        jitter: Randomize each delay to avoid synchronized retries
 
     Usage:
         @retry_on_error(max_retries=3, delay=2)
@@ -240,13 +300,14 @@ def retry_on_error(max_retries=DEFAULT_MAX_RETRIES, delay=DEFAULT_RETRY_DELAY,
                 except exceptions as e:
                     last_exception = e
                     if attempt < max_retries:
+                        wait = _retry_delay(attempt, delay, backoff_factor, max_delay, jitter)
                         _logger.warning(
                             f"Attempt {attempt + 1}/{max_retries + 1} failed for "
-                            f"{func.__name__}: {e}. Retrying in {delay}s..."
+                            f"{func.__name__}: {e}. Retrying in {wait:.1f}s..."
                         )
                         if on_retry:
                             on_retry(attempt + 1, e)
-                        time.sleep(delay)
+                        time.sleep(wait)
                     else:
                         _logger.error(
                             f"All {max_retries + 1} attempts failed for {func.__name__}"
@@ -257,7 +318,9 @@ def retry_on_error(max_retries=DEFAULT_MAX_RETRIES, delay=DEFAULT_RETRY_DELAY,
 
 
 def retry_database_operation(cr, func, max_retries=DEFAULT_MAX_RETRIES,
-                             delay=DEFAULT_RETRY_DELAY):
+                             delay=DEFAULT_RETRY_DELAY,
+                             backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                             max_delay=DEFAULT_MAX_DELAY, jitter=True):
     """
     Execute a database operation with retry and savepoint.
 
@@ -265,7 +328,10 @@ def retry_database_operation(cr, func, max_retries=DEFAULT_MAX_RETRIES,
         cr: Database cursor
         func: Function to execute (receives cr as argument)
         max_retries: Maximum retry attempts
-        delay: Delay between retries
+        delay: Base delay between retries
+        backoff_factor: Multiplier applied to the delay after each attempt
+        max_delay: Upper bound for a single delay in seconds
+        jitter: Randomize each delay to avoid synchronized retries
 
     Returns:
         Result of func() on success
@@ -275,29 +341,31 @@ def retry_database_operation(cr, func, max_retries=DEFAULT_MAX_RETRIES,
     """
     last_exception = None
 
-    for attempt in range(max_retries + 1):
-        # Generate and validate savepoint name
-        raw_name = f"retry_sp_{attempt}_{int(time.time() * 1000)}"
-        savepoint_name = validate_savepoint_name(raw_name)
+    # One savepoint name for all attempts: a rolled back savepoint can be
+    # established again, so the statements are built once per call
+    savepoint_name = validate_savepoint_name(f"retry_sp_{int(time.time() * 1000)}")
+    create_sql, release_sql, rollback_sql = _savepoint_queries(savepoint_name)
 
+    for attempt in range(max_retries + 1):
         try:
-            cr.execute(f"SAVEPOINT {savepoint_name}")
+            cr.execute(create_sql)
             result = func(cr)
-            cr.execute(f"RELEASE SAVEPOINT {savepoint_name}")
+            cr.execute(release_sql)
             return result
         except Exception as e:
             last_exception = e
             try:
-                cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint_name}")
+                cr.execute(rollback_sql)
             except Exception as rollback_error:
                 _logger.warning(f"Failed to rollback savepoint {savepoint_name}: {rollback_error}")
 
             if attempt < max_retries:
+                wait = _retry_delay(attempt, delay, backoff_factor, max_delay, jitter)
                 _logger.warning(
                     f"Database operation failed (attempt {attempt + 1}): {e}. "
-                    f"Retrying in {delay}s..."
+                    f"Retrying in {wait:.1f}s..."
                 )
-                time.sleep(delay)
+                time.sleep(wait)
             else:
                 _logger.error(f"All retry attempts failed: {e}")
 
@@ -308,7 +376,10 @@ class CronLock:
     """
     Lock mechanism specifically for cron jobs to prevent overlapping runs.
 
-    Uses a database table to track running cron jobs.
+    Uses a session-level PostgreSQL advisory lock, which is atomic, survives
+    the cron's intermediate commits and is released automatically if the
+    holding connection drops. The holder's hostname and start time are kept
+    in ir.config_parameter, for observability and to report long-held locks.
 
     Usage:
         with CronLock(env, 'support_module_installer'):
@@ -323,44 +394,110 @@ class CronLock:
         Args:
             env: Odoo environment
             cron_name: Unique identifier for this cron job
-            timeout_minutes: Consider lock stale after this many minutes
+            timeout_minutes: Age after which a still held lock is logged
+                as suspicious
         """
         self.env = env
         self.cron_name = cron_name
         self.timeout_minutes = timeout_minutes
+        self.lock_id = lock_name_to_id(f'cron.lock.{cron_name}')
         self.lock_acquired = False
 
-    def acquire(self):
-        """Try to acquire the cron lock."""
-        ICP = self.env['ir.config_parameter'].sudo()
-        lock_key = f'cron.lock.{self.cron_name}'
-        lock_time_key = f'cron.lock.{self.cron_name}.time'
+    @property
+    def _channel(self):
+        """LISTEN/NOTIFY channel used to wake up waiters on release."""
+        return f'cronlock_{self.lock_id}'
 
-        current_time = time.time()
+    def _try_lock(self):
+        """Try to take the advisory lock on the environment's connection."""
+        self.env.cr.execute(
+            "SELECT pg_try_advisory_lock(%s::bigint)",
+            [self.lock_id]
+        )
+        return self.env.cr.fetchone()[0]
 
-        # Check if lock exists and is not stale
-        existing_lock = ICP.get_param(lock_key)
-        if existing_lock:
-            lock_time = float(ICP.get_param(lock_time_key, 0))
-            age_minutes = (current_time - lock_time) / 60
+    def _warn_if_stale(self):
+        """
+        Log the holder of a lock held for longer than timeout_minutes.
 
-            if age_minutes < self.timeout_minutes:
-                _logger.info(
-                    f"Cron lock {self.cron_name} held by another process "
-                    f"(age: {age_minutes:.1f} min)"
-                )
-                return False
-            else:
-                _logger.warning(
-                    f"Cron lock {self.cron_name} is stale "
-                    f"(age: {age_minutes:.1f} min), stealing it"
-                )
+        The holder is never terminated: a cron that committed and is busy
+        with SSH or Docker work shows as idle between statements, so idle
+        does not mean leaked. A lock whose backend died is already released
+        by PostgreSQL, so a lock still held always has a live backend.
+        """
+        holder = self.env['ir.config_parameter'].sudo().get_param(f'cron.lock.{self.cron_name}')
+        try:
+            started = float(holder.rsplit(':', 1)[1]) if holder else 0.0
+        except (IndexError, ValueError):
+            started = 0.0
+        if not started or time.time() - started < self.timeout_minutes * 60:
+            return
+
+        self.env.cr.execute("""
+            SELECT l.pid, a.state, a.backend_start
+              FROM pg_locks l
+              JOIN pg_stat_activity a ON a.pid = l.pid
+             WHERE l.locktype = 'advisory'
+               AND l.classid = %s::oid
+               AND l.objid = %s::oid
+               AND l.objsubid = 1
+               AND l.granted
+        """, [self.lock_id >> 32, self.lock_id & 0xFFFFFFFF])
+        for pid, state, backend_start in self.env.cr.fetchall():
+            _logger.warning(
+                f"Cron lock {self.cron_name} held for over {self.timeout_minutes} minutes "
+                f"(holder: {holder}, pid {pid}, state {state}, backend started {backend_start})"
+            )
+
+    def _wait_for_lock(self, max_wait):
+        """
+        Wait until the lock is released by its holder, then take it.
+
+        Listens on a dedicated connection (LISTEN only takes effect once
+        committed) and sleeps in select() until the holder's NOTIFY or the
+        deadline, instead of polling the database.
+        """
+        deadline = time.monotonic() + max_wait
+        with sql_db.db_connect(self.env.cr.dbname).cursor() as listen_cr:
+            listen_cr.execute(f'LISTEN "{self._channel}"')
+            listen_cr.commit()
+            conn = listen_cr._cnx
+            try:
+                while True:
+                    if self._try_lock():
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    if select.select([conn], [], [], remaining) != ([], [], []):
+                        conn.poll()
+                        conn.notifies.clear()
+            finally:
+                # The connection goes back to the pool: stop receiving
+                # this channel's notifications before handing it over
+                listen_cr.execute(f'UNLISTEN "{self._channel}"')
+                listen_cr.commit()
+                conn.notifies.clear()
 
-        # Acquire lock
+    def acquire(self, wait=False, max_wait=60):
+        """
+        Try to acquire the cron lock.
+
+        Args:
+            wait: If True, wait for the holder to release the lock
+            max_wait: Maximum time to wait in seconds
+        """
+        acquired = self._try_lock()
+        if not acquired:
+            self._warn_if_stale()
+        if not acquired and not (wait and self._wait_for_lock(max_wait)):
+            _logger.info(f"Cron lock {self.cron_name} held by another process")
+            return False
+
+        # Record holder for observability only (not used for locking)
         import socket
-        lock_value = f"{socket.gethostname()}:{time.time()}"
-        ICP.set_param(lock_key, lock_value)
-        ICP.set_param(lock_time_key, str(current_time))
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param(f'cron.lock.{self.cron_name}', f"{socket.gethostname()}:{time.time()}")
         self.lock_acquired = True
 
         _logger.info(f"Cron lock acquired: {self.cron_name}")
@@ -368,16 +505,40 @@ class CronLock:
 
     def release(self):
         """Release the cron lock."""
-        if self.lock_acquired:
-            ICP = self.env['ir.config_parameter'].sudo()
-            lock_key = f'cron.lock.{self.cron_name}'
-            lock_time_key = f'cron.lock.{self.cron_name}.time'
+        if not self.lock_acquired:
+            return
+        self.lock_acquired = False
+
+        # Unlock first and on its own: a session-level lock that is not
+        # released stays held by the pooled connection
+        try:
+            self._unlock()
+        except Exception as e:
+            # An aborted transaction rejects every statement; roll it back
+            # and retry, the lock itself is not transactional
+            _logger.warning(f"Retrying release of cron lock {self.cron_name} after rollback: {e}")
+            try:
+                self.env.cr.rollback()
+                self._unlock()
+            except Exception as e:
+                _logger.error(f"Failed to release cron lock {self.cron_name}: {e}")
+                return
+
+        try:
+            self.env['ir.config_parameter'].sudo().set_param(f'cron.lock.{self.cron_name}', False)
+            # Delivered to waiters when this transaction commits
+            self.env.cr.execute(f'NOTIFY "{self._channel}"')
+        except Exception as e:
+            _logger.warning(f"Failed to clear cron lock holder {self.cron_name}: {e}")
 
-            ICP.set_param(lock_key, False)
-            ICP.set_param(lock_time_key, False)
-            self.lock_acquired = False
+        _logger.info(f"Cron lock released: {self.cron_name}")
 
-            _logger.info(f"Cron lock released: {self.cron_name}")
+    def _unlock(self):
+        """Release the advisory lock held by the environment's connection."""
+        self.env.cr.execute(
+            "SELECT pg_advisory_unlock(%s::bigint)",
+            [self.lock_id]
+        )
 
     def __enter__(self):
         if not self.acquire():
@@ -389,7 +550,8 @@ class CronLock:
         return False
 
 
-def with_cron_lock(cron_name, timeout_minutes=30, skip_if_locked=True):
+def with_cron_lock(cron_name, timeout_minutes=30, skip_if_locked=True,
+                   wait=False, max_wait=60):
     """
     Decorator for cron job methods to ensure single execution.
 
@@ -397,6 +559,8 @@ def with_cron_lock(cron_name, timeout_minutes=30, skip_if_locked=True):
         cron_name: Unique name for this cron job
         timeout_minutes: Lock timeout
         skip_if_locked: If True, skip silently when locked; if False, raise error
+        wait: If True, wait up to max_wait seconds for the lock to be released
+        max_wait: Maximum time to wait in seconds
 
     Usage:
         @with_cron_lock('my_cron_job')
@@ -408,7 +572,7 @@ def with_cron_lock(cron_name, timeout_minutes=30, skip_if_locked=True):
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             lock = CronLock(self.env, cron_name, timeout_minutes)
-            if not lock.acquire():
+            if not lock.acquire(wait=wait, max_wait=max_wait):
                 if skip_if_locked:
                     _logger.info(f"Skipping {cron_name} - already running")
                     return True
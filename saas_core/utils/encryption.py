@@ -16,20 +16,132 @@ import hashlib
 import logging
 import os
 import secrets
+import time
 from functools import lru_cache
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 _logger = logging.getLogger(__name__)
 
+_blake2b = hashlib.blake2b
+
 # Configuration parameter keys
 ENCRYPTION_KEY_PARAM = 'saas.pii_encryption_key'
 ENCRYPTION_SALT_PARAM = 'saas.pii_encryption_salt'
+# Environment variables that take precedence over the config parameters
+ENCRYPTION_KEY_ENV = 'SAAS_PII_KEY'
+ENCRYPTION_SALT_ENV = 'SAAS_PII_SALT'
+# Derived key cache, suffixed by the key fingerprint (same exposure as key + salt)
+DERIVED_KEY_PARAM_PREFIX = 'saas.pii_derived_key.'
 
 # Marker prefix for encrypted values (to detect already encrypted data)
 ENCRYPTED_PREFIX = 'ENC::'
+ENCRYPTED_PREFIX_B = ENCRYPTED_PREFIX.encode()
+_ENC_PREFIX_LEN = len(ENCRYPTED_PREFIX)
+
+# Marker after ENC:: for AES-256-GCM payloads; values without it are
+# legacy Fernet (AES-128-CBC + HMAC) tokens
+AESGCM_MARKER = 'v2:'
+AESGCM_MARKER_B = AESGCM_MARKER.encode()
+_AESGCM_NONCE_SIZE = 12
+
+
+# Random bytes per (master key, salt) pair
+_MASTER_KEY_BYTES = 32
+_SALT_BYTES = 16
+
+# Seconds a master key/salt pair read from ir.config_parameter is reused
+# before it is read again. The rotating worker clears its cache on commit;
+# other workers may keep using the old pair for up to this long.
+_KEY_MATERIAL_TTL = 30
+
+
+def _rand_pool(n):
+    """Read n random bytes from the OS CSPRNG in a single call."""
+    return os.urandom(n)
+
+
+def generate_key_material(count=1):
+    """
+    Generate (master_key, salt) pairs from a single random block.
+
+    Values use the same encoding as secrets.token_urlsafe (32 and 16
+    bytes of entropy), but all pairs come from one os.urandom call.
+
+    Args:
+        count: Number of pairs to generate
+
+    Returns:
+        list: [(master_key, salt), ...]
+    """
+    pair_size = _MASTER_KEY_BYTES + _SALT_BYTES
+    pool = _rand_pool(pair_size * count)
+    pairs = []
+    for offset in range(0, pair_size * count, pair_size):
+        master_key = pool[offset:offset + _MASTER_KEY_BYTES]
+        salt = pool[offset + _MASTER_KEY_BYTES:offset + pair_size]
+        pairs.append((
+            base64.urlsafe_b64encode(master_key).rstrip(b'=').decode(),
+            base64.urlsafe_b64encode(salt).rstrip(b'=').decode(),
+        ))
+    return pairs
+
+
+class PiiCipher:
+    """
+    AES-256-GCM cipher for PII values, with legacy Fernet decryption.
+
+    Payloads are base64url(nonce || ciphertext || tag) prefixed with
+    AESGCM_MARKER. Tokens written by older versions (Fernet) are still
+    decrypted with a Fernet instance built from the same derived key.
+    """
+
+    __slots__ = ('_aead', '_fernet')
+
+    def __init__(self, raw_key):
+        # Separate AES-GCM key so it is never shared with the Fernet key
+        aead_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'saas-pii-aes-256-gcm',
+        ).derive(raw_key)
+        self._aead = AESGCM(aead_key)
+        self._fernet = Fernet(base64.urlsafe_b64encode(raw_key))
+
+    def encrypt_b(self, data):
+        """Encrypt bytes and return the payload as bytes (without ENC:: prefix)."""
+        nonce = os.urandom(_AESGCM_NONCE_SIZE)
+        sealed = self._aead.encrypt(nonce, data, None)
+        return AESGCM_MARKER_B + base64.urlsafe_b64encode(nonce + sealed)
+
+    def encrypt(self, data):
+        """Encrypt bytes and return the payload string (without ENC:: prefix)."""
+        return self.encrypt_b(data).decode()
+
+    def decrypt(self, payload):
+        """
+        Decrypt a payload (str or bytes, without ENC:: prefix) and return bytes.
+
+        Raises:
+            InvalidToken: If the key does not match or data is corrupted
+        """
+        marker = AESGCM_MARKER_B if isinstance(payload, bytes) else AESGCM_MARKER
+        if payload[:len(marker)] == marker:
+            # b64decode accepts ASCII str directly, no intermediate encode
+            raw = base64.urlsafe_b64decode(payload[len(marker):])
+            try:
+                return self._aead.decrypt(
+                    raw[:_AESGCM_NONCE_SIZE], raw[_AESGCM_NONCE_SIZE:], None
+                )
+            except InvalidTag:
+                raise InvalidToken()
+        return self._fernet.decrypt(payload)
 
 
 class EncryptionKeyManager:
@@ -44,28 +156,63 @@ class EncryptionKeyManager:
     """
 
     _instance = None
-    _fernet = None
+    # Ciphers keyed by (dbname, key fingerprint)
+    _cipher_cache = {}
+    # Key material read from ir.config_parameter: dbname -> (expires, (master_key, salt))
+    _material_cache = {}
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def get_or_create_key(self, env):
+    @staticmethod
+    def _get_env_key_material():
         """
-        Get existing encryption key or create a new one.
+        Get the master key and salt from the process environment.
+
+        Returns:
+            tuple: (master_key, salt), or None unless both variables are set
+        """
+        master_key = os.environ.get(ENCRYPTION_KEY_ENV)
+        salt = os.environ.get(ENCRYPTION_SALT_ENV)
+        if master_key and salt:
+            return master_key, salt
+        return None
+
+    def _get_or_create_key_material(self, env):
+        """
+        Get the master key and salt, generating them if they do not exist.
+
+        SAAS_PII_KEY/SAAS_PII_SALT environment variables take precedence
+        over ir.config_parameter and need no database access. Material read
+        from ir.config_parameter is cached per database for
+        _KEY_MATERIAL_TTL seconds and dropped whenever config parameters
+        are modified (see clear_key_material_cache).
 
         Args:
             env: Odoo environment
 
         Returns:
-            bytes: The encryption key
+            tuple: (master_key, salt)
         """
+        env_material = self._get_env_key_material()
+        if env_material:
+            return env_material
+
+        dbname = env.cr.dbname
+        now = time.monotonic()
+        cached = self._material_cache.get(dbname)
+        if cached and cached[0] > now:
+            return cached[1]
+
         ICP = env['ir.config_parameter'].sudo()
+        generated = False
 
         # Get or create master key
         master_key = ICP.get_param(ENCRYPTION_KEY_PARAM)
         if not master_key:
+            generated = True
             # Generate a new master key (32 bytes = 256 bits)
             master_key = secrets.token_urlsafe(32)
             ICP.set_param(ENCRYPTION_KEY_PARAM, master_key)
@@ -74,35 +221,111 @@ class EncryptionKeyManager:
         # Get or create salt
         salt = ICP.get_param(ENCRYPTION_SALT_PARAM)
         if not salt:
+            generated = True
             salt = secrets.token_urlsafe(16)
             ICP.set_param(ENCRYPTION_SALT_PARAM, salt)
             _logger.info("Generated new PII encryption salt")
 
-        # Derive key using PBKDF2
+        # Freshly generated material is not cached: if this transaction
+        # rolls back, it was never stored
+        if not generated:
+            self._material_cache[dbname] = (now + _KEY_MATERIAL_TTL, (master_key, salt))
+        return master_key, salt
+
+    @staticmethod
+    def _derive_key(master_key, salt):
+        """Derive the raw 32-byte key from master key and salt using PBKDF2."""
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt.encode(),
             iterations=100000,
         )
-        derived_key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
+        return kdf.derive(master_key.encode())
+
+    @staticmethod
+    def _fingerprint(master_key, salt):
+        """Return a non-reversible fingerprint identifying a key/salt pair."""
+        return hashlib.sha256(f'{master_key}:{salt}'.encode()).hexdigest()[:16]
+
+    def _get_derived_key(self, env, master_key, salt, fingerprint):
+        """
+        Get the derived key from its config parameter, deriving it on a miss.
+
+        Skips the PBKDF2 iterations on every process start: only a real key
+        rotation (new fingerprint) derives again.
+
+        Args:
+            env: Odoo environment
+            master_key: Master key
+            salt: Salt
+            fingerprint: Fingerprint of (master_key, salt)
 
+        Returns:
+            bytes: The raw 32-byte encryption key
+        """
+        ICP = env['ir.config_parameter'].sudo()
+        param = DERIVED_KEY_PARAM_PREFIX + fingerprint
+
+        stored = ICP.get_param(param)
+        if stored:
+            try:
+                derived_key = base64.urlsafe_b64decode(stored)
+                if len(derived_key) == 32:
+                    return derived_key
+            except ValueError:
+                pass
+            _logger.warning("Ignoring malformed cached PII derived key")
+
+        derived_key = self._derive_key(master_key, salt)
+        try:
+            with env.cr.savepoint():
+                ICP.set_param(param, base64.urlsafe_b64encode(derived_key).decode())
+        except Exception as e:
+            _logger.debug(f"Could not cache PII derived key: {e}")
         return derived_key
 
-    def get_fernet(self, env):
+    def get_or_create_key(self, env):
+        """
+        Get existing encryption key or create a new one.
+
+        Args:
+            env: Odoo environment
+
+        Returns:
+            bytes: The raw 32-byte encryption key
         """
-        Get a Fernet instance for encryption/decryption.
+        master_key, salt = self._get_or_create_key_material(env)
+        return self._derive_key(master_key, salt)
+
+    def get_cipher(self, env):
+        """
+        Get a cipher instance for encryption/decryption.
+
+        The derived key is cached per database and key fingerprint, so
+        PBKDF2 only runs once per key per process. The key material itself
+        is cached for _KEY_MATERIAL_TTL seconds, so a key rotated by another
+        worker is picked up once that expires.
 
         Args:
             env: Odoo environment
 
         Returns:
-            Fernet: Fernet encryption instance
+            PiiCipher: Cipher instance
         """
-        if self._fernet is None:
-            key = self.get_or_create_key(env)
-            self._fernet = Fernet(key)
-        return self._fernet
+        master_key, salt = self._get_or_create_key_material(env)
+        fingerprint = self._fingerprint(master_key, salt)
+        cache_key = (env.cr.dbname, fingerprint)
+        cipher = self._cipher_cache.get(cache_key)
+        if cipher is None:
+            if self._get_env_key_material():
+                # Never persist a key derived from material kept out of the database
+                derived_key = self._derive_key(master_key, salt)
+            else:
+                derived_key = self._get_derived_key(env, master_key, salt, fingerprint)
+            cipher = PiiCipher(derived_key)
+            self._cipher_cache[cache_key] = cipher
+        return cipher
 
     def rotate_key(self, env):
         """
@@ -114,17 +337,34 @@ class EncryptionKeyManager:
         Args:
             env: Odoo environment
         """
+        if self._get_env_key_material():
+            _logger.warning(
+                f"PII encryption key is set via {ENCRYPTION_KEY_ENV}/{ENCRYPTION_SALT_ENV}; "
+                "rotate it in the environment instead"
+            )
+            return False
+
         ICP = env['ir.config_parameter'].sudo()
 
+        # Forget the derived key of the old master key
+        old_master_key = ICP.get_param(ENCRYPTION_KEY_PARAM)
+        old_salt = ICP.get_param(ENCRYPTION_SALT_PARAM)
+        if old_master_key and old_salt:
+            ICP.set_param(
+                DERIVED_KEY_PARAM_PREFIX + self._fingerprint(old_master_key, old_salt), False
+            )
+
         # Generate new key and salt
-        new_master_key = secrets.token_urlsafe(32)
-        new_salt = secrets.token_urlsafe(16)
+        new_master_key, new_salt = generate_key_material()[0]
 
         ICP.set_param(ENCRYPTION_KEY_PARAM, new_master_key)
         ICP.set_param(ENCRYPTION_SALT_PARAM, new_salt)
 
-        # Clear cached fernet
-        self._fernet = None
+        # Drop cached key material and ciphers of this database
+        dbname = env.cr.dbname
+        self._material_cache.pop(dbname, None)
+        for cache_key in [k for k in self._cipher_cache if k[0] == dbname]:
+            self._cipher_cache.pop(cache_key, None)
 
         _logger.warning("Encryption key rotated! Existing encrypted data must be re-encrypted.")
         return True
@@ -134,9 +374,17 @@ class EncryptionKeyManager:
 _key_manager = EncryptionKeyManager()
 
 
+def clear_key_material_cache(dbname=None):
+    """Drop cached key material (of one database, or all)."""
+    if dbname is None:
+        EncryptionKeyManager._material_cache.clear()
+        return
+    EncryptionKeyManager._material_cache.pop(dbname, None)
+
+
 def encrypt_value(env, value):
     """
-    Encrypt a string value using Fernet (AES-128-CBC).
+    Encrypt a string value using AES-256-GCM.
 
     Args:
         env: Odoo environment
@@ -153,9 +401,11 @@ def encrypt_value(env, value):
         return value
 
     try:
-        fernet = _key_manager.get_fernet(env)
-        encrypted = fernet.encrypt(value.encode())
-        return ENCRYPTED_PREFIX + encrypted.decode()
+        cipher = _key_manager.get_cipher(env)
+        if isinstance(value, (bytes, bytearray)):
+            # Already encoded: skip the str round-trip
+            return encrypt_value_b(cipher, bytes(value)).decode()
+        return ENCRYPTED_PREFIX + cipher.encrypt(value.encode())
     except Exception as e:
         _logger.error(f"Encryption failed: {e}")
         # Return original value if encryption fails (fail-safe)
@@ -181,10 +431,8 @@ def decrypt_value(env, value):
         return value
 
     try:
-        fernet = _key_manager.get_fernet(env)
-        encrypted_data = value[len(ENCRYPTED_PREFIX):]
-        decrypted = fernet.decrypt(encrypted_data.encode())
-        return decrypted.decode()
+        cipher = _key_manager.get_cipher(env)
+        return cipher.decrypt(value[_ENC_PREFIX_LEN:]).decode()
     except InvalidToken:
         _logger.error("Decryption failed: Invalid token (key mismatch or corrupted data)")
         return "[DECRYPTION_FAILED]"
@@ -193,6 +441,144 @@ def decrypt_value(env, value):
         return "[DECRYPTION_FAILED]"
 
 
+def encrypt_value_b(cipher, value_bytes):
+    """
+    Encrypt already encoded bytes with a resolved cipher.
+
+    Args:
+        cipher: PiiCipher from EncryptionKeyManager.get_cipher
+        value_bytes: Plaintext bytes
+
+    Returns:
+        bytes: Encrypted value with ENC:: prefix
+    """
+    return ENCRYPTED_PREFIX_B + cipher.encrypt_b(value_bytes)
+
+
+def decrypt_value_b(cipher, token_bytes):
+    """
+    Decrypt bytes produced by encrypt_value_b with a resolved cipher.
+
+    Args:
+        cipher: PiiCipher from EncryptionKeyManager.get_cipher
+        token_bytes: Encrypted value with ENC:: prefix
+
+    Returns:
+        bytes: Plaintext bytes
+
+    Raises:
+        InvalidToken: If the key does not match or data is corrupted
+    """
+    return cipher.decrypt(token_bytes[_ENC_PREFIX_LEN:])
+
+
+def gather_values(dicts, field_names, encrypted):
+    """
+    Collect the values of field_names across a list of dicts for batch work.
+
+    Args:
+        dicts: List of vals / record dictionaries
+        field_names: Field names to inspect
+        encrypted: True to collect ENC:: values (to decrypt), False to
+            collect non-empty plaintext values (to encrypt)
+
+    Returns:
+        tuple: (targets, values) where targets is a list of (dict, field_name)
+    """
+    targets = []
+    values = []
+    add_target = targets.append
+    add_value = values.append
+    prefix = ENCRYPTED_PREFIX
+    prefix_len = _ENC_PREFIX_LEN
+    for item in dicts:
+        get = item.get
+        for field_name in field_names:
+            value = get(field_name)
+            if not value:
+                continue
+            if (type(value) is str and value[:prefix_len] == prefix) is encrypted:
+                add_target((item, field_name))
+                add_value(value)
+    return targets, values
+
+
+def scatter_values(targets, values):
+    """Write batch results back into the dicts collected by gather_values."""
+    for (item, field_name), value in zip(targets, values):
+        item[field_name] = value
+
+
+def encrypt_batch(env, values):
+    """
+    Encrypt a list of string values with a single key lookup.
+
+    Empty and already encrypted values are returned unchanged.
+
+    Args:
+        env: Odoo environment
+        values: List of string values to encrypt
+
+    Returns:
+        list: Encrypted values (with ENC:: prefix), in the same order
+    """
+    try:
+        encrypt = _key_manager.get_cipher(env).encrypt
+        return [
+            ENCRYPTED_PREFIX + encrypt(value.encode())
+            if value and not (type(value) is str and value[:_ENC_PREFIX_LEN] == ENCRYPTED_PREFIX)
+            else value
+            for value in values
+        ]
+    except Exception as e:
+        _logger.error(f"Batch encryption failed: {e}")
+        # Return original values if encryption fails (fail-safe)
+        return list(values)
+
+
+def decrypt_batch(env, values):
+    """
+    Decrypt a list of values encrypted with encrypt_value/encrypt_batch.
+
+    The key is resolved once for the whole batch. Values without the
+    ENC:: prefix are returned unchanged.
+
+    Args:
+        env: Odoo environment
+        values: List of encrypted strings (with ENC:: prefix)
+
+    Returns:
+        list: Decrypted values, in the same order
+    """
+    if not any(type(value) is str and value[:_ENC_PREFIX_LEN] == ENCRYPTED_PREFIX for value in values):
+        return list(values)
+
+    try:
+        cipher = _key_manager.get_cipher(env)
+    except Exception as e:
+        _logger.error(f"Decryption failed: {e}")
+        return [
+            "[DECRYPTION_FAILED]" if type(value) is str and value[:_ENC_PREFIX_LEN] == ENCRYPTED_PREFIX
+            else value
+            for value in values
+        ]
+
+    result = []
+    for value in values:
+        if type(value) is not str or value[:_ENC_PREFIX_LEN] != ENCRYPTED_PREFIX:
+            result.append(value)
+            continue
+        try:
+            result.append(cipher.decrypt(value[_ENC_PREFIX_LEN:]).decode())
+        except InvalidToken:
+            _logger.error("Decryption failed: Invalid token (key mismatch or corrupted data)")
+            result.append("[DECRYPTION_FAILED]")
+        except Exception as e:
+            _logger.error(f"Decryption failed: {e}")
+            result.append("[DECRYPTION_FAILED]")
+    return result
+
+
 def is_encrypted(value):
     """
     Check if a value is encrypted.
@@ -203,7 +589,7 @@ def is_encrypted(value):
     Returns:
         bool: True if value appears to be encrypted
     """
-    return isinstance(value, str) and value.startswith(ENCRYPTED_PREFIX)
+    return type(value) is str and value[:_ENC_PREFIX_LEN] == ENCRYPTED_PREFIX
 
 
 def hash_for_search(value):
@@ -211,7 +597,7 @@ def hash_for_search(value):
     Create a searchable hash of a value.
 
     This allows searching encrypted fields without decrypting all records.
-    Uses SHA-256 truncated to 16 chars for indexing.
+    Uses an 8-byte BLAKE2b digest (16 hex chars) for indexing.
 
     Args:
         value: Original plaintext value
@@ -223,11 +609,7 @@ def hash_for_search(value):
         return None
 
     # Normalize: lowercase and strip
-    normalized = value.lower().strip()
-
-    # SHA-256 hash, truncated
-    hash_obj = hashlib.sha256(normalized.encode())
-    return hash_obj.hexdigest()[:16]
+    return _blake2b(value.lower().strip().encode(), digest_size=8).hexdigest()
 
 
 def get_key_info(env):
@@ -240,10 +622,13 @@ def get_key_info(env):
     Returns:
         dict: Key information (without exposing the actual key)
     """
-    ICP = env['ir.config_parameter'].sudo()
-
-    master_key = ICP.get_param(ENCRYPTION_KEY_PARAM)
-    salt = ICP.get_param(ENCRYPTION_SALT_PARAM)
+    env_material = EncryptionKeyManager._get_env_key_material()
+    if env_material:
+        master_key, salt = env_material
+    else:
+        ICP = env['ir.config_parameter'].sudo()
+        master_key = ICP.get_param(ENCRYPTION_KEY_PARAM)
+        salt = ICP.get_param(ENCRYPTION_SALT_PARAM)
 
     if not master_key:
         return {
@@ -257,8 +642,9 @@ def get_key_info(env):
     return {
         'status': 'configured',
         'fingerprint': fingerprint.upper(),
-        'algorithm': 'AES-128-CBC (Fernet)',
+        'algorithm': 'AES-256-GCM',
         'kdf': 'PBKDF2-SHA256',
         'iterations': 100000,
         'salt_configured': bool(salt),
+        'source': 'environment' if env_material else 'database',
     }
@@ -6,11 +6,22 @@ Provides secure remote command execution without shell injection vulnerabilities
 Uses paramiko for SSH connections when available, with secure fallback.
 """
 
+import functools
+import hashlib
 import logging
 import re
+import select
 import shlex
+import shutil
+import socket
 import subprocess
 import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+from types import SimpleNamespace
 from typing import Optional, Tuple, List
 
 _logger = logging.getLogger(__name__)
@@ -23,13 +34,151 @@ except ImportError:
     HAS_PARAMIKO = False
     _logger.warning("paramiko not installed - using fallback SSH method")
 
+# Host keys shared by all paramiko clients of the process: known_hosts is
+# parsed on first use, and keys accepted by AutoAddPolicy are remembered
+# so later connections to the same host verify them. Clients only work on
+# copies; the shared table is read and updated under _HOST_KEYS_LOCK.
+_HOST_KEYS_LOCK = threading.Lock()
+_SHARED_HOST_KEYS = None
+
+
+def _host_key_name(host: str, port: int) -> str:
+    """Host key table entry name, as paramiko looks it up."""
+    return host if port == 22 else f'[{host}]:{port}'
+
+
+def _known_host_keys(name: str) -> dict:
+    """Return a copy of the keys known for a host, as {keytype: key}."""
+    global _SHARED_HOST_KEYS
+    with _HOST_KEYS_LOCK:
+        if _SHARED_HOST_KEYS is None:
+            _SHARED_HOST_KEYS = paramiko.HostKeys()
+            known_hosts = os.path.expanduser('~/.ssh/known_hosts')
+            if os.path.exists(known_hosts):
+                try:
+                    _SHARED_HOST_KEYS.load(known_hosts)
+                except (IOError, paramiko.SSHException) as e:
+                    _logger.warning(f"Could not load {known_hosts}: {e}")
+        keys = _SHARED_HOST_KEYS.lookup(name)
+        return dict(keys) if keys else {}
+
+
+def _remember_host_keys(name: str, keys: dict):
+    """Add keys accepted for a host to the shared table."""
+    with _HOST_KEYS_LOCK:
+        for keytype, key in keys.items():
+            _SHARED_HOST_KEYS.add(name, keytype, key)
+
 
 # Validation patterns for safe values
 SAFE_IDENTIFIER_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_\-]*$')
 SAFE_DB_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
 SAFE_CONTAINER_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9_\.\-]*$')
 SAFE_PATH_PATTERN = re.compile(r'^[a-zA-Z0-9_/\.\-]+$')
-SAFE_IP_PATTERN = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
+
+# SSH connection reuse
+SSH_KEEPALIVE_INTERVAL = 30  # seconds
+SSH_POOL_MAX_IDLE = 32  # idle connections kept across all hosts
+SSH_POOL_IDLE_TIMEOUT = 300  # seconds before an idle connection is closed
+SSH_RECV_BUFSIZE = 32768
+SSH_CONTROL_PERSIST = 600  # seconds an unused OpenSSH master stays alive
+
+
+@functools.lru_cache(maxsize=None)
+def _ssh_binary() -> str:
+    """
+    Absolute path of the ssh client, resolved once per process.
+
+    Spares the child process an execve() attempt per PATH entry on every
+    call; subprocess already spawns via vfork, so the parent's size does
+    not add to the cost.
+    """
+    return shutil.which('ssh') or 'ssh'
+
+
+def _quote_cmd(command: List[str]) -> str:
+    """
+    Join a command into a shell-escaped string.
+
+    Not memoized: commands may carry passwords or tokens, which must not
+    outlive the call in process memory.
+    """
+    return ' '.join(shlex.quote(arg) for arg in command)
+
+
+class _ControlMaster:
+    """Shared OpenSSH master of the subprocess fallback, for one pool key."""
+
+    __slots__ = ('lock', 'users', 'started')
+
+    def __init__(self):
+        self.lock = threading.Lock()  # serializes starting and stopping
+        self.users = 0  # connected clients, guarded by _CONTROL_LOCK
+        self.started = False
+
+
+# Control masters by socket path, in a private directory of this process
+_CONTROL_LOCK = threading.Lock()
+_CONTROL_STATE = SimpleNamespace(pid=None, dir=None, masters={})
+
+
+def _control_master(key: tuple) -> Tuple[str, _ControlMaster]:
+    """
+    Socket path and shared master for a pool key (lock must be held).
+
+    The directory comes from mkdtemp(), so it is 0700 and owned by this
+    process, never a pre-created one in the shared temp dir. A forked
+    child gets its own directory and stops none of its parent's masters.
+    """
+    state = _CONTROL_STATE
+    if state.pid != os.getpid():
+        state.dir = tempfile.mkdtemp(prefix='saas-ssh-')
+        state.masters = {}
+        state.pid = os.getpid()
+    # The key file is part of the key: clients with different keys never
+    # share a master
+    name = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+    control_path = os.path.join(state.dir, name)
+    return control_path, state.masters.setdefault(control_path, _ControlMaster())
+
+
+# Process-local cache of config parameters: (dbname, name) -> (expires, value)
+_PARAM_CACHE = {}
+# Modifications clear the modifying worker's cache on commit; other
+# workers may serve the old value for up to this long
+_PARAM_CACHE_TTL = 30  # seconds
+
+
+def _get_param_cached(env, name, default=None):
+    """
+    Read an ir.config_parameter value through a short-lived process cache.
+
+    Entries expire after _PARAM_CACHE_TTL seconds and are cleared whenever
+    config parameters are modified (see clear_param_cache).
+
+    Args:
+        env: Odoo environment
+        name: Config parameter name
+        default: Value returned when the parameter is not set
+    """
+    key = (env.cr.dbname, name)
+    now = time.monotonic()
+    cached = _PARAM_CACHE.get(key)
+    if cached and cached[0] > now:
+        value = cached[1]
+    else:
+        value = env['ir.config_parameter'].sudo().get_param(name)
+        _PARAM_CACHE[key] = (now + _PARAM_CACHE_TTL, value)
+    return value if value else default
+
+
+def clear_param_cache(dbname=None):
+    """Drop cached config parameters (of one database, or all)."""
+    if dbname is None:
+        _PARAM_CACHE.clear()
+        return
+    for key in [k for k in _PARAM_CACHE if k[0] == dbname]:
+        _PARAM_CACHE.pop(key, None)
 
 
 class ValidationError(Exception):
@@ -37,96 +186,131 @@ class ValidationError(Exception):
     pass
 
 
-def validate_identifier(value: str, name: str = "identifier") -> str:
+class ValidatedIdentifier(str):
     """
-    Validate an identifier (database name, container name, etc.).
+    String already accepted by a validator.
+
+    Builders skip re-validating values of the matching subclass, so names
+    validated once upstream are not scanned again on every command build.
+    """
+    __slots__ = ()
+
+
+class ValidatedDatabaseName(ValidatedIdentifier):
+    """Database name returned by validate_database_name."""
+    __slots__ = ()
+
+
+class ValidatedContainerName(ValidatedIdentifier):
+    """Container name returned by validate_container_name."""
+    __slots__ = ()
+
+
+class _Spec(namedtuple('_Spec', 'pattern max_len name msg result_type')):
+    """Validation rule: regex, max length, field label, pattern error, result type."""
+    __slots__ = ()
+
+
+_IDENTIFIER_SPEC = _Spec(
+    SAFE_IDENTIFIER_PATTERN, 128, 'identifier',
+    "Invalid {name}: must start with letter/underscore, "
+    "contain only alphanumeric/underscore/dash",
+    str,
+)
+_DB_NAME_SPEC = _Spec(
+    SAFE_DB_NAME_PATTERN, 63, 'Database name',
+    "Invalid database name: must start with letter/underscore, "
+    "contain only alphanumeric/underscore",
+    ValidatedDatabaseName,
+)
+_CONTAINER_NAME_SPEC = _Spec(
+    SAFE_CONTAINER_NAME_PATTERN, 128, 'Container name',
+    "Invalid container name: must start with alphanumeric, "
+    "contain only alphanumeric/underscore/dot/dash",
+    ValidatedContainerName,
+)
+_PATH_SPEC = _Spec(
+    SAFE_PATH_PATTERN, 4096, 'Path',
+    "Invalid path: contains unsafe characters",
+    str,
+)
+
+
+def _validate(value: str, spec: _Spec, name: Optional[str] = None) -> str:
+    """
+    Validate a value against a spec.
 
     Args:
         value: The value to validate
-        name: Name of the field for error messages
+        spec: Validation rule
+        name: Field label for error messages (defaults to spec.name)
 
     Returns:
-        The validated value
+        The stripped value, as spec.result_type
 
     Raises:
         ValidationError: If validation fails
     """
+    # Values already accepted by this same spec are returned as-is
+    if spec.result_type is not str and type(value) is spec.result_type:
+        return value
+
+    name = name or spec.name
     if not value:
         raise ValidationError(f"{name} cannot be empty")
 
     if not isinstance(value, str):
         raise ValidationError(f"{name} must be a string")
 
-    # Remove any null bytes or control characters
-    value = value.replace('\x00', '').strip()
+    # Reject null bytes instead of silently stripping them
+    if '\x00' in value:
+        raise ValidationError(f"{name} contains null byte")
+    value = value.strip()
 
-    if len(value) > 128:
-        raise ValidationError(f"{name} too long (max 128 chars)")
+    if len(value) > spec.max_len:
+        raise ValidationError(f"{name} too long (max {spec.max_len} chars)")
 
-    if not SAFE_IDENTIFIER_PATTERN.match(value):
-        raise ValidationError(
-            f"Invalid {name}: must start with letter/underscore, "
-            f"contain only alphanumeric/underscore/dash"
-        )
+    if not spec.pattern.match(value):
+        raise ValidationError(spec.msg.format(name=name))
 
-    return value
+    return value if spec.result_type is str else spec.result_type(value)
 
 
-def validate_database_name(db_name: str) -> str:
-    """Validate a PostgreSQL database name."""
-    if not db_name:
-        raise ValidationError("Database name cannot be empty")
+def validate_identifier(value: str, name: str = "identifier") -> str:
+    """
+    Validate an identifier (database name, container name, etc.).
+
+    Args:
+        value: The value to validate
+        name: Name of the field for error messages
 
-    db_name = db_name.replace('\x00', '').strip()
+    Returns:
+        The validated value
 
-    if len(db_name) > 63:
-        raise ValidationError("Database name too long (max 63 chars)")
+    Raises:
+        ValidationError: If validation fails
+    """
+    return _validate(value, _IDENTIFIER_SPEC, name)
 
-    if not SAFE_DB_NAME_PATTERN.match(db_name):
-        raise ValidationError(
-            "Invalid database name: must start with letter/underscore, "
-            "contain only alphanumeric/underscore"
-        )
 
-    return db_name
+def validate_database_name(db_name: str) -> str:
+    """Validate a PostgreSQL database name."""
+    return _validate(db_name, _DB_NAME_SPEC)
 
 
 def validate_container_name(container_name: str) -> str:
     """Validate a Docker container name."""
-    if not container_name:
-        raise ValidationError("Container name cannot be empty")
-
-    container_name = container_name.replace('\x00', '').strip()
-
-    if len(container_name) > 128:
-        raise ValidationError("Container name too long (max 128 chars)")
-
-    if not SAFE_CONTAINER_NAME_PATTERN.match(container_name):
-        raise ValidationError(
-            "Invalid container name: must start with alphanumeric, "
-            "contain only alphanumeric/underscore/dot/dash"
-        )
-
-    return container_name
+    return _validate(container_name, _CONTAINER_NAME_SPEC)
 
 
 def validate_path(path: str) -> str:
     """Validate a file path."""
-    if not path:
-        raise ValidationError("Path cannot be empty")
-
-    path = path.replace('\x00', '').strip()
-
-    if len(path) > 4096:
-        raise ValidationError("Path too long")
+    path = _validate(path, _PATH_SPEC)
 
     # Check for path traversal
     if '..' in path:
         raise ValidationError("Path cannot contain '..'")
 
-    if not SAFE_PATH_PATTERN.match(path):
-        raise ValidationError("Invalid path: contains unsafe characters")
-
     return path
 
 
@@ -135,17 +319,18 @@ def validate_ip_address(ip: str) -> str:
     if not ip:
         raise ValidationError("IP address cannot be empty")
 
-    ip = ip.replace('\x00', '').strip()
+    # Reject null bytes instead of silently stripping them
+    if '\x00' in ip:
+        raise ValidationError("IP address contains null byte")
+    ip = ip.strip()
 
-    if not SAFE_IP_PATTERN.match(ip):
+    # Strict dotted-quad parse (format and octet ranges) in a single C call;
+    # unlike inet_aton, inet_pton rejects shorthand forms like '127.1'
+    try:
+        socket.inet_pton(socket.AF_INET, ip)
+    except (OSError, ValueError):
         raise ValidationError("Invalid IP address format")
 
-    # Validate each octet
-    parts = ip.split('.')
-    for part in parts:
-        if int(part) > 255:
-            raise ValidationError("Invalid IP address: octet > 255")
-
     return ip
 
 
@@ -180,18 +365,110 @@ class SecureSSHClient:
         self.port = port
         self.timeout = timeout
         self._client = None
+        self._control_path = None
+        self._control_master = None
 
     def connect(self):
         """Establish SSH connection."""
         if HAS_PARAMIKO:
             self._connect_paramiko()
         else:
-            # For fallback, we just validate connection is possible
-            pass
+            self._connect_control_master()
+
+    def _fallback_ssh_args(self) -> List[str]:
+        """Base ssh arguments shared by the fallback master and commands."""
+        ssh_args = [_ssh_binary(), '-o', 'StrictHostKeyChecking=accept-new',
+                    '-o', f'ConnectTimeout={self.timeout}']
+        if self.key_file:
+            ssh_args.extend(['-i', self.key_file])
+        return ssh_args
+
+    def _connect_control_master(self):
+        """
+        Attach to the OpenSSH ControlMaster of this client's pool key.
+
+        Subsequent ssh invocations reuse the authenticated master connection
+        through its control socket instead of doing a full handshake each.
+        Clients with the same (host, port, username, key_file) share one
+        master, started by the first of them and stopped when the last one
+        is closed, i.e. evicted from the pool. If the master cannot be
+        started, commands connect directly.
+        """
+        try:
+            with _CONTROL_LOCK:
+                control_path, master = _control_master(
+                    (self.host, self.port, self.username, self.key_file)
+                )
+                master.users += 1
+        except OSError as e:
+            _logger.warning(f"Cannot create SSH control directory, not multiplexing: {e}")
+            return
+
+        with master.lock:
+            if not master.started:
+                master.started = self._start_control_master(control_path)
+            started = master.started
+        if started:
+            self._control_path = control_path
+            self._control_master = master
+        else:
+            with _CONTROL_LOCK:
+                master.users -= 1
+
+    def _start_control_master(self, control_path: str) -> bool:
+        """Start a background master on control_path, returning success."""
+        ssh_args = self._fallback_ssh_args()
+        ssh_args.extend([
+            '-M', '-S', control_path,
+            '-o', f'ControlPersist={SSH_CONTROL_PERSIST}',
+            '-f', '-N',
+            f'{self.username}@{self.host}',
+        ])
+        try:
+            result = subprocess.run(
+                ssh_args,
+                capture_output=True,
+                timeout=self.timeout + 5,
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            _logger.warning(f"SSH control master to {self.host} failed: {e}")
+            return False
+        if result.returncode != 0:
+            _logger.warning(
+                f"SSH control master to {self.host} failed: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+            return False
+        _logger.debug(f"SSH control master started for {self.host}")
+        return True
+
+    def _stop_control_master(self):
+        """Detach from the control master, stopping it if no client is left."""
+        control_path, self._control_path = self._control_path, None
+        master, self._control_master = self._control_master, None
+        with master.lock:
+            with _CONTROL_LOCK:
+                master.users -= 1
+                last = master.users == 0
+            if not (last and master.started):
+                return
+            master.started = False
+            try:
+                subprocess.run(
+                    [_ssh_binary(), '-S', control_path, '-O', 'exit', f'{self.username}@{self.host}'],
+                    capture_output=True,
+                    timeout=10,
+                )
+            except (subprocess.TimeoutExpired, OSError) as e:
+                _logger.debug(f"Failed to stop SSH control master for {self.host}: {e}")
 
     def _connect_paramiko(self):
         """Connect using paramiko."""
         self._client = paramiko.SSHClient()
+        host_key_name = _host_key_name(self.host, self.port)
+        host_keys = self._client.get_host_keys()
+        for keytype, key in _known_host_keys(host_key_name).items():
+            host_keys.add(host_key_name, keytype, key)
         self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
         connect_kwargs = {
@@ -207,13 +484,31 @@ class SecureSSHClient:
             connect_kwargs['password'] = self.password
 
         self._client.connect(**connect_kwargs)
+        accepted = host_keys.lookup(host_key_name)
+        if accepted:
+            _remember_host_keys(host_key_name, dict(accepted))
+        transport = self._client.get_transport()
+        if transport:
+            transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
         _logger.debug(f"SSH connected to {self.host} via paramiko")
 
+    def is_active(self) -> bool:
+        """Check whether the client can still execute commands."""
+        if not HAS_PARAMIKO:
+            # The subprocess fallback holds no connection state
+            return True
+        if not self._client:
+            return False
+        transport = self._client.get_transport()
+        return bool(transport and transport.is_active())
+
     def close(self):
         """Close SSH connection."""
         if self._client:
             self._client.close()
             self._client = None
+        if self._control_path:
+            self._stop_control_master()
 
     def execute(self, command: List[str], timeout: int = 300) -> Tuple[int, str, str]:
         """
@@ -234,36 +529,106 @@ class SecureSSHClient:
     def _execute_paramiko(self, command: List[str], timeout: int) -> Tuple[int, str, str]:
         """Execute command using paramiko."""
         # Join command with proper shell escaping
-        cmd_str = ' '.join(shlex.quote(arg) for arg in command)
+        cmd_str = _quote_cmd(command)
 
         stdin, stdout, stderr = self._client.exec_command(cmd_str, timeout=timeout)
         exit_code = stdout.channel.recv_exit_status()
 
         return exit_code, stdout.read().decode(), stderr.read().decode()
 
+    def execute_batch(self, commands: List[List[str]],
+                      timeout: int = 300) -> List[Tuple[int, str, str]]:
+        """
+        Execute several independent commands concurrently on the remote host.
+
+        With paramiko, every command runs on its own channel of the same
+        transport, so the round trips overlap instead of adding up.
+        Commands must not depend on each other's side effects.
+
+        Args:
+            commands: List of commands, each a list of arguments
+            timeout: Timeout in seconds for the whole batch
+
+        Returns:
+            List of (exit_code, stdout, stderr) tuples, in command order
+        """
+        if HAS_PARAMIKO and self._client:
+            return self._execute_batch_paramiko(commands, timeout)
+        return [self._execute_fallback(command, timeout) for command in commands]
+
+    def _execute_batch_paramiko(self, commands: List[List[str]],
+                                timeout: int) -> List[Tuple[int, str, str]]:
+        """Execute commands on parallel channels of one paramiko transport."""
+        transport = self._client.get_transport()
+        channels = []
+        try:
+            for command in commands:
+                chan = transport.open_session(timeout=self.timeout)
+                chan.exec_command(_quote_cmd(command))
+                channels.append(chan)
+
+            stdout = [[] for _chan in channels]
+            stderr = [[] for _chan in channels]
+            results = [None] * len(channels)
+            pending = dict(enumerate(channels))
+            deadline = time.monotonic() + timeout
+
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Channels expose a pipe fd signalled on incoming stdout data
+                # and closure; poll briefly so stderr-only output is drained too
+                select.select(list(pending.values()), [], [], min(remaining, 0.1))
+                for index, chan in list(pending.items()):
+                    while chan.recv_ready():
+                        stdout[index].append(chan.recv(SSH_RECV_BUFSIZE))
+                    while chan.recv_stderr_ready():
+                        stderr[index].append(chan.recv_stderr(SSH_RECV_BUFSIZE))
+                    if chan.exit_status_ready() and not chan.recv_ready() \
+                            and not chan.recv_stderr_ready():
+                        results[index] = (
+                            chan.recv_exit_status(),
+                            b''.join(stdout[index]).decode(),
+                            b''.join(stderr[index]).decode(),
+                        )
+                        del pending[index]
+
+            for index in pending:
+                results[index] = (-1, b''.join(stdout[index]).decode(), 'Command timed out')
+            return results
+        finally:
+            for chan in channels:
+                chan.close()
+
     def _execute_fallback(self, command: List[str], timeout: int) -> Tuple[int, str, str]:
         """Execute command using subprocess with secure handling."""
         # Build SSH command without shell=True
-        ssh_args = ['ssh', '-o', 'StrictHostKeyChecking=accept-new',
-                    '-o', f'ConnectTimeout={self.timeout}']
+        ssh_args = self._fallback_ssh_args()
 
-        if self.key_file:
-            ssh_args.extend(['-i', self.key_file])
+        if self._control_path:
+            # Reuse the master connection started in connect()
+            ssh_args.extend(['-S', self._control_path])
 
         ssh_args.append(f'{self.username}@{self.host}')
 
         # The remote command is passed as a single argument
-        remote_cmd = ' '.join(shlex.quote(arg) for arg in command)
+        remote_cmd = _quote_cmd(command)
         ssh_args.append(remote_cmd)
 
         try:
+            # Capture bytes and decode once as UTF-8, matching the paramiko
+            # path, rather than through the locale codec of text mode
             result = subprocess.run(
                 ssh_args,
                 capture_output=True,
-                text=True,
                 timeout=timeout
             )
-            return result.returncode, result.stdout, result.stderr
+            return (
+                result.returncode,
+                result.stdout.decode('utf-8', 'replace'),
+                result.stderr.decode('utf-8', 'replace'),
+            )
         except subprocess.TimeoutExpired:
             return -1, '', 'Command timed out'
         except Exception as e:
@@ -278,6 +643,161 @@ class SecureSSHClient:
         return False
 
 
+class SSHConnectionPool:
+    """
+    Thread-safe pool of connected SecureSSHClient instances.
+
+    Idle clients are kept per (host, port, username, key_file) and reused,
+    saving the TCP and SSH handshake on every remote command. Clients idle
+    for longer than ``idle_timeout`` are closed on the next pool access;
+    beyond ``max_idle`` idle clients, the least recently used are closed.
+
+    Usage:
+        with ssh_pool.acquire(host, username, key_file) as ssh:
+            ssh.execute(['docker', 'ps'])
+    """
+
+    def __init__(self, max_idle: int = SSH_POOL_MAX_IDLE,
+                 idle_timeout: int = SSH_POOL_IDLE_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # key -> deque of (last_used, client), least recently used key first
+        self._idle = OrderedDict()
+        self._idle_count = 0
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _key(client: SecureSSHClient) -> tuple:
+        return (client.host, client.port, client.username, client.key_file)
+
+    def _take_expired(self, now: float) -> list:
+        """Detach idle clients past their timeout (lock must be held)."""
+        expired = []
+        limit = now - self.idle_timeout
+        for key in list(self._idle):
+            clients = self._idle[key]
+            while clients and clients[0][0] < limit:
+                expired.append(clients.popleft()[1])
+            if not clients:
+                del self._idle[key]
+        self._idle_count -= len(expired)
+        return expired
+
+    def _check_fork(self):
+        """Drop connections inherited from a parent process (lock must be held)."""
+        pid = os.getpid()
+        if pid != self._pid:
+            # Sockets are shared with the parent; forget them without closing
+            self._idle.clear()
+            self._idle_count = 0
+            self._pid = pid
+
+    @staticmethod
+    def _close_all(clients):
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                _logger.debug(f"Error closing pooled SSH connection: {e}")
+
+    def checkout(self, host: str, username: str = 'root',
+                 key_file: Optional[str] = None, port: int = 22,
+                 timeout: int = 30) -> SecureSSHClient:
+        """
+        Get a connected client, reusing an idle one when possible.
+
+        Args:
+            host: Remote host IP
+            username: SSH username
+            key_file: Path to SSH private key
+            port: SSH port
+            timeout: Connection timeout for new connections
+
+        Returns:
+            SecureSSHClient: Connected client, to be given back with release()
+        """
+        host = validate_ip_address(host)
+        key = (host, port, username, key_file)
+        with self._lock:
+            self._check_fork()
+            stale = self._take_expired(time.monotonic())
+            client = None
+            clients = self._idle.get(key)
+            while clients:
+                # Most recently used first: it is the most likely to be alive
+                candidate = clients.pop()[1]
+                self._idle_count -= 1
+                if candidate.is_active():
+                    client = candidate
+                    break
+                stale.append(candidate)
+            if clients is not None and not clients:
+                del self._idle[key]
+        self._close_all(stale)
+
+        if client is None:
+            client = SecureSSHClient(
+                host=host, username=username, key_file=key_file,
+                port=port, timeout=timeout,
+            )
+            client.connect()
+        return client
+
+    def release(self, client: SecureSSHClient):
+        """Give a client back to the pool for reuse."""
+        if not client.is_active():
+            client.close()
+            return
+        key = self._key(client)
+        with self._lock:
+            self._check_fork()
+            now = time.monotonic()
+            evicted = self._take_expired(now)
+            self._idle.setdefault(key, deque()).append((now, client))
+            self._idle.move_to_end(key)
+            self._idle_count += 1
+            while self._idle_count > self.max_idle:
+                lru_key = next(iter(self._idle))
+                clients = self._idle[lru_key]
+                evicted.append(clients.popleft()[1])
+                self._idle_count -= 1
+                if not clients:
+                    del self._idle[lru_key]
+        self._close_all(evicted)
+
+    @contextmanager
+    def acquire(self, host: str, username: str = 'root',
+                key_file: Optional[str] = None, port: int = 22,
+                timeout: int = 30):
+        """
+        Context manager around checkout()/release().
+
+        The client is closed instead of pooled if the block raises, as the
+        connection may be left in an undefined state.
+        """
+        client = self.checkout(host, username, key_file, port, timeout)
+        try:
+            yield client
+        except BaseException:
+            client.close()
+            raise
+        self.release(client)
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            self._check_fork()
+            clients = [client for entries in self._idle.values() for _ts, client in entries]
+            self._idle.clear()
+            self._idle_count = 0
+        self._close_all(clients)
+
+
+# Process-wide pool used by safe_remote_execute
+ssh_pool = SSHConnectionPool()
+
+
 def get_db_password_from_config(env, param_name: str = 'saas.tenant_db_password') -> str:
     """
     Get database password from secure config parameter.
@@ -289,8 +809,7 @@ def get_db_password_from_config(env, param_name: str = 'saas.tenant_db_password'
     Returns:
         Database password
     """
-    ICP = env['ir.config_parameter'].sudo()
-    password = ICP.get_param(param_name)
+    password = _get_param_cached(env, param_name)
 
     if not password:
         # Fallback to default (should be set during installation)
@@ -300,6 +819,16 @@ def get_db_password_from_config(env, param_name: str = 'saas.tenant_db_password'
     return password
 
 
+# build_pg_command action -> builder(base_args, db_name)
+_PG_BUILDERS = {
+    'dump': lambda base, db: ['pg_dump', *base, db],
+    'restore': lambda base, db: ['psql', *base, '-d', db],
+    'drop': lambda base, db: ['dropdb', *base, '--if-exists', db],
+    'create': lambda base, db: ['createdb', *base, db],
+    'psql': lambda base, db: ['psql', *base, '-d', db],
+}
+
+
 def build_pg_command(action: str, db_name: str, db_user: str = 'odoo',
                      db_host: str = 'localhost', extra_args: List[str] = None) -> List[str]:
     """
@@ -317,21 +846,13 @@ def build_pg_command(action: str, db_name: str, db_user: str = 'odoo',
     """
     db_name = validate_database_name(db_name)
 
-    base_args = ['-h', db_host, '-U', db_user]
-
-    if action == 'dump':
-        cmd = ['pg_dump'] + base_args + [db_name]
-    elif action == 'restore':
-        cmd = ['psql'] + base_args + ['-d', db_name]
-    elif action == 'drop':
-        cmd = ['dropdb'] + base_args + ['--if-exists', db_name]
-    elif action == 'create':
-        cmd = ['createdb'] + base_args + [db_name]
-    elif action == 'psql':
-        cmd = ['psql'] + base_args + ['-d', db_name]
-    else:
+    try:
+        builder = _PG_BUILDERS[action]
+    except KeyError:
         raise ValidationError(f"Unknown action: {action}")
 
+    cmd = builder(('-h', db_host, '-U', db_user), db_name)
+
     if extra_args:
         cmd.extend(extra_args)
 
@@ -378,15 +899,13 @@ def safe_remote_execute(env, server_ip: str, command: List[str],
     Returns:
         Tuple of (exit_code, stdout, stderr)
     """
-    ICP = env['ir.config_parameter'].sudo()
-
     # Get SSH credentials from config
-    ssh_key_path = ICP.get_param('saas.tenant_ssh_key_path', '/root/.ssh/tenant_key')
-    ssh_user = ICP.get_param('saas.tenant_ssh_user', 'root')
+    ssh_key_path = _get_param_cached(env, 'saas.tenant_ssh_key_path', '/root/.ssh/tenant_key')
+    ssh_user = _get_param_cached(env, 'saas.tenant_ssh_user', 'root')
 
     try:
-        with SecureSSHClient(
-            host=server_ip,
+        with ssh_pool.acquire(
+            server_ip,
             username=ssh_user,
             key_file=ssh_key_path,
             timeout=30
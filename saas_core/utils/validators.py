@@ -17,6 +17,21 @@ from odoo.addons.saas_core.constants.reserved import (
 from odoo.addons.saas_core.constants.messages import ValidationErrors
 from odoo.addons.saas_core.constants.config import OdooVersions
 
+# Precompiled validation patterns
+# Format, start and end rules fused into one anchored pattern (fast path)
+_SUBDOMAIN_FULL_RE = re.compile(r'^[a-z0-9](?:[a-z0-9-]{0,28}[a-z0-9])?$')
+# Fine-grained rules, only used to pick the error message on failure
+_SUBDOMAIN_RE = re.compile(r'^[a-z0-9-]+$')
+_SUBDOMAIN_START_RE = re.compile(r'^[a-z0-9]')
+_SUBDOMAIN_END_RE = re.compile(r'.*[a-z0-9]$')
+# All blocked patterns as one alternation (same re.match semantics as
+# matching each pattern in turn)
+_BLOCKED_RE = re.compile('|'.join(f'(?:{p})' for p in BLOCKED_SUBDOMAIN_PATTERNS))
+# Email parts, checked after splitting on '@' and the last '.' so that no
+# pattern can backtrack across them
+_EMAIL_LOCAL_RE = re.compile(r'[a-zA-Z0-9._%+-]+')
+_EMAIL_DOMAIN_RE = re.compile(r'[a-zA-Z0-9.-]+')
+
 
 def validate_subdomain(subdomain):
     """
@@ -44,26 +59,24 @@ def validate_subdomain(subdomain):
     if len(subdomain) > 30:
         raise ValidationError(ValidationErrors.SUBDOMAIN_TOO_LONG)
 
-    # Check format: only lowercase letters, numbers, and hyphens
-    if not re.match(r'^[a-z0-9-]+$', subdomain):
+    # Only lowercase letters, numbers, and hyphens, starting and ending
+    # with a letter or number
+    if not _SUBDOMAIN_FULL_RE.match(subdomain):
+        if not _SUBDOMAIN_RE.match(subdomain):
+            raise ValidationError(ValidationErrors.SUBDOMAIN_INVALID)
+        if not _SUBDOMAIN_START_RE.match(subdomain):
+            raise ValidationError(ValidationErrors.SUBDOMAIN_INVALID_START)
+        if not _SUBDOMAIN_END_RE.match(subdomain):
+            raise ValidationError(ValidationErrors.SUBDOMAIN_INVALID_END)
         raise ValidationError(ValidationErrors.SUBDOMAIN_INVALID)
 
-    # Must start with letter or number
-    if not re.match(r'^[a-z0-9]', subdomain):
-        raise ValidationError(ValidationErrors.SUBDOMAIN_INVALID_START)
-
-    # Must end with letter or number
-    if not re.match(r'.*[a-z0-9]$', subdomain):
-        raise ValidationError(ValidationErrors.SUBDOMAIN_INVALID_END)
-
     # Check against reserved subdomains
     if subdomain in RESERVED_SUBDOMAINS:
         raise ValidationError(ValidationErrors.SUBDOMAIN_RESERVED)
 
     # Check against blocked patterns
-    for pattern in BLOCKED_SUBDOMAIN_PATTERNS:
-        if re.match(pattern, subdomain):
-            raise ValidationError(ValidationErrors.SUBDOMAIN_RESERVED)
+    if _BLOCKED_RE.match(subdomain):
+        raise ValidationError(ValidationErrors.SUBDOMAIN_RESERVED)
 
     return subdomain
 
@@ -86,9 +99,15 @@ def normalize_email(email):
 
     email = email.lower().strip()
 
-    # Basic email format validation
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    # Basic email format validation: local@domain.tld, checked in linear time
+    local, at, domain = email.partition('@')
+    host, dot, tld = domain.rpartition('.')
+    if not (
+        at and dot
+        and len(tld) >= 2 and tld.isascii() and tld.isalpha()
+        and _EMAIL_LOCAL_RE.fullmatch(local)
+        and _EMAIL_DOMAIN_RE.fullmatch(host)
+    ):
         raise ValidationError(ValidationErrors.EMAIL_INVALID)
 
     return email
@@ -6,7 +6,7 @@ Support Ticket model for SaaS helpdesk.
 import logging
 from datetime import datetime, timedelta
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import UserError
 
 from odoo.addons.saas_core.constants.fields import ModelNames
@@ -21,14 +21,25 @@ class TicketPriority:
     HIGH = '2'
     URGENT = '3'
 
+    SELECTION = [
+        (LOW, 'Low'),
+        (MEDIUM, 'Medium'),
+        (HIGH, 'High'),
+        (URGENT, 'Urgent'),
+    ]
+
     @classmethod
     def get_selection(cls):
-        return [
-            (cls.LOW, 'Low'),
-            (cls.MEDIUM, 'Medium'),
-            (cls.HIGH, 'High'),
-            (cls.URGENT, 'Urgent'),
-        ]
+        return cls.SELECTION
+
+
+# Kanban color per ticket priority
+PRIORITY_COLORS = {
+    TicketPriority.LOW: 0,      # Grey
+    TicketPriority.MEDIUM: 4,   # Blue
+    TicketPriority.HIGH: 2,     # Orange
+    TicketPriority.URGENT: 1,   # Red
+}
 
 
 class TicketState:
@@ -41,22 +52,68 @@ class TicketState:
     CLOSED = 'closed'
     CANCELLED = 'cancelled'
 
+    SELECTION = [
+        (NEW, 'New'),
+        (OPEN, 'Open'),
+        (IN_PROGRESS, 'In Progress'),
+        (PENDING, 'Pending Customer'),
+        (RESOLVED, 'Resolved'),
+        (CLOSED, 'Closed'),
+        (CANCELLED, 'Cancelled'),
+    ]
+
+    # States considered 'open' for SLA purposes
+    OPEN_STATES = frozenset({NEW, OPEN, IN_PROGRESS, PENDING})
+    # States in which the resolution SLA is settled
+    TERMINAL_STATES = frozenset({RESOLVED, CLOSED})
+    # States not counted as open tickets
+    INACTIVE_STATES = frozenset({RESOLVED, CLOSED, CANCELLED})
+
     @classmethod
     def get_selection(cls):
-        return [
-            (cls.NEW, 'New'),
-            (cls.OPEN, 'Open'),
-            (cls.IN_PROGRESS, 'In Progress'),
-            (cls.PENDING, 'Pending Customer'),
-            (cls.RESOLVED, 'Resolved'),
-            (cls.CLOSED, 'Closed'),
-            (cls.CANCELLED, 'Cancelled'),
-        ]
+        return cls.SELECTION
 
     @classmethod
     def get_open_states(cls):
         """States considered 'open' for SLA purposes."""
-        return [cls.NEW, cls.OPEN, cls.IN_PROGRESS, cls.PENDING]
+        return [state for state, _label in cls.SELECTION if state in cls.OPEN_STATES]
+
+
+# Ticket state machine: (current state, action) -> new state.
+# Pairs missing from the table are forbidden transitions.
+_ALL_STATES = frozenset(state for state, _label in TicketState.SELECTION)
+_ACTIONS = (
+    # action, allowed source states, target state
+    ('open', {TicketState.NEW}, TicketState.OPEN),
+    ('start', {TicketState.NEW, TicketState.OPEN, TicketState.PENDING}, TicketState.IN_PROGRESS),
+    ('pending', {TicketState.OPEN, TicketState.IN_PROGRESS}, TicketState.PENDING),
+    ('resolve', _ALL_STATES - {TicketState.CLOSED, TicketState.CANCELLED}, TicketState.RESOLVED),
+    ('close', _ALL_STATES - {TicketState.CANCELLED}, TicketState.CLOSED),
+    ('reopen', TicketState.TERMINAL_STATES, TicketState.OPEN),
+    ('cancel', _ALL_STATES - {TicketState.CLOSED}, TicketState.CANCELLED),
+)
+_TRANSITIONS = {
+    (state, action): target
+    for action, sources, target in _ACTIONS
+    for state in sources
+}
+_ACTION_TARGETS = {action: target for action, _sources, target in _ACTIONS}
+
+
+def _sla_final_status(hours, target):
+    """SLA status once the measured event happened."""
+    return 'met' if hours <= target else 'breached'
+
+
+def _sla_running_status(elapsed, target):
+    """SLA status while still waiting, from the elapsed hours (or None)."""
+    if elapsed is None:
+        return 'on_track'
+    if elapsed > target:
+        return 'breached'
+    if elapsed > target * 0.8:
+        return 'warning'
+    return 'on_track'
 
 
 class SaasTicket(models.Model):
@@ -73,6 +130,13 @@ class SaasTicket(models.Model):
         'Ticket reference must be unique!'
     )
 
+    # Composite indexes for SLA dashboards ("open tickets by age") and
+    # "my open tickets"; the first also covers lookups on state alone
+    _state_create_date_idx = models.Index('(state, create_date DESC)')
+    _user_open_state_idx = models.Index(
+        '(user_id, state) WHERE state NOT IN (\'resolved\', \'closed\', \'cancelled\')'
+    )
+
     # Basic fields
     name = fields.Char(
         string='Subject',
@@ -92,15 +156,14 @@ class SaasTicket(models.Model):
 
     # State and priority
     state = fields.Selection(
-        selection=TicketState.get_selection(),
+        selection=TicketState.SELECTION,
         string='Status',
         default=TicketState.NEW,
         required=True,
         tracking=True,
-        index=True,
     )
     priority = fields.Selection(
-        selection=TicketPriority.get_selection(),
+        selection=TicketPriority.SELECTION,
         string='Priority',
         default=TicketPriority.MEDIUM,
         required=True,
@@ -118,8 +181,8 @@ class SaasTicket(models.Model):
     )
     color = fields.Integer(
         string='Color',
-        compute='_compute_color',
-        store=True,
+        readonly=True,
+        help='Kanban color, kept in sync with the priority',
     )
 
     # Category
@@ -143,11 +206,13 @@ class SaasTicket(models.Model):
         related='partner_id.email',
         string='Customer Email',
         readonly=True,
+        store=True,
     )
     partner_phone = fields.Char(
         related='partner_id.phone',
         string='Customer Phone',
         readonly=True,
+        store=True,
     )
 
     # Related SaaS records
@@ -176,6 +241,7 @@ class SaasTicket(models.Model):
     team_id = fields.Many2one(
         'res.users',
         string='Team Lead',
+        index=True,
         help='Team lead responsible for this ticket',
     )
 
@@ -222,7 +288,7 @@ class SaasTicket(models.Model):
             ('met', 'Met'),
         ],
         string='Response SLA',
-        compute='_compute_sla_status',
+        compute='_compute_sla_response_status',
         store=True,
     )
     sla_resolution_status = fields.Selection(
@@ -233,7 +299,7 @@ class SaasTicket(models.Model):
             ('met', 'Met'),
         ],
         string='Resolution SLA',
-        compute='_compute_sla_status',
+        compute='_compute_sla_resolution_status',
         store=True,
     )
 
@@ -245,8 +311,9 @@ class SaasTicket(models.Model):
     )
     ticket_message_count = fields.Integer(
         string='Message Count',
-        compute='_compute_ticket_message_count',
-        store=True,
+        readonly=True,
+        default=0,
+        help='Maintained incrementally by saas.ticket.message create/write/unlink',
     )
 
     # Tags for additional categorization
@@ -255,91 +322,119 @@ class SaasTicket(models.Model):
         string='Tags',
     )
 
-    @api.depends('priority')
-    def _compute_color(self):
-        """Set color based on priority."""
-        color_map = {
-            TicketPriority.LOW: 0,      # Grey
-            TicketPriority.MEDIUM: 4,   # Blue
-            TicketPriority.HIGH: 2,     # Orange
-            TicketPriority.URGENT: 1,   # Red
-        }
-        for ticket in self:
-            ticket.color = color_map.get(ticket.priority, 0)
+    def init(self):
+        """Backfill colors of existing tickets from their priority in SQL."""
+        self.env.cr.execute(
+            """
+            UPDATE saas_ticket t
+            SET color = c.color
+            FROM (VALUES {values}) AS c(priority, color)
+            WHERE t.priority = c.priority
+              AND t.color IS DISTINCT FROM c.color
+            """.format(values=', '.join(['(%s, %s)'] * len(PRIORITY_COLORS))),
+            [value for item in PRIORITY_COLORS.items() for value in item],
+        )
 
     @api.depends('first_response_date', 'resolved_date', 'create_date')
     def _compute_sla_times(self):
         """Calculate SLA times in hours."""
+        hour = timedelta(hours=1)
         for ticket in self:
-            if ticket.first_response_date and ticket.create_date:
-                delta = ticket.first_response_date - ticket.create_date
-                ticket.sla_response_hours = delta.total_seconds() / 3600
-            else:
+            created = ticket.create_date
+            if not created:
                 ticket.sla_response_hours = 0
-
-            if ticket.resolved_date and ticket.create_date:
-                delta = ticket.resolved_date - ticket.create_date
-                ticket.sla_resolution_hours = delta.total_seconds() / 3600
-            else:
                 ticket.sla_resolution_hours = 0
-
-    @api.depends('sla_response_hours', 'sla_resolution_hours', 'category_id',
-                 'first_response_date', 'resolved_date', 'state', 'create_date')
-    def _compute_sla_status(self):
-        """Calculate SLA status."""
+                continue
+
+            first_response = ticket.first_response_date
+            resolved = ticket.resolved_date
+            ticket.sla_response_hours = (first_response - created) / hour if first_response else 0
+            ticket.sla_resolution_hours = (resolved - created) / hour if resolved else 0
+
+    def _get_sla_targets(self, field_name, default):
+        """
+        Get one SLA target of all involved categories, fetched in one query.
+
+        Args:
+            field_name: Category field holding the target (hours)
+            default: Target used when unset or without category
+
+        Returns:
+            dict: Category id -> target hours (key False for no category)
+        """
+        targets = {category.id: category[field_name] or default for category in self.category_id}
+        targets[False] = default
+        return targets
+
+    @api.depends('sla_response_hours', 'category_id', 'first_response_date', 'create_date')
+    def _compute_sla_response_status(self):
+        """Calculate response SLA status."""
         now = fields.Datetime.now()
+        hour = timedelta(hours=1)
+        targets = self._get_sla_targets('sla_response_time', 24.0)
         for ticket in self:
-            response_target = ticket.category_id.sla_response_time or 24.0
-            resolution_target = ticket.category_id.sla_resolution_time or 72.0
-
-            # Response SLA
+            target = targets[ticket.category_id.id]
+            # Answered tickets only compare the stored duration
             if ticket.first_response_date:
-                if ticket.sla_response_hours <= response_target:
-                    ticket.sla_response_status = 'met'
-                else:
-                    ticket.sla_response_status = 'breached'
-            elif ticket.create_date:
-                elapsed = (now - ticket.create_date).total_seconds() / 3600
-                if elapsed > response_target:
-                    ticket.sla_response_status = 'breached'
-                elif elapsed > response_target * 0.8:
-                    ticket.sla_response_status = 'warning'
-                else:
-                    ticket.sla_response_status = 'on_track'
-            else:
-                ticket.sla_response_status = 'on_track'
-
-            # Resolution SLA
-            if ticket.state in ['resolved', 'closed']:
-                if ticket.sla_resolution_hours <= resolution_target:
-                    ticket.sla_resolution_status = 'met'
-                else:
-                    ticket.sla_resolution_status = 'breached'
-            elif ticket.create_date:
-                elapsed = (now - ticket.create_date).total_seconds() / 3600
-                if elapsed > resolution_target:
-                    ticket.sla_resolution_status = 'breached'
-                elif elapsed > resolution_target * 0.8:
-                    ticket.sla_resolution_status = 'warning'
-                else:
-                    ticket.sla_resolution_status = 'on_track'
+                ticket.sla_response_status = _sla_final_status(ticket.sla_response_hours, target)
             else:
-                ticket.sla_resolution_status = 'on_track'
+                elapsed = (now - ticket.create_date) / hour if ticket.create_date else None
+                ticket.sla_response_status = _sla_running_status(elapsed, target)
 
-    @api.depends('ticket_message_ids')
-    def _compute_ticket_message_count(self):
-        """Count messages on this ticket."""
+    @api.depends('sla_resolution_hours', 'category_id', 'resolved_date', 'state', 'create_date')
+    def _compute_sla_resolution_status(self):
+        """Calculate resolution SLA status."""
+        now = fields.Datetime.now()
+        hour = timedelta(hours=1)
+        targets = self._get_sla_targets('sla_resolution_time', 72.0)
         for ticket in self:
-            ticket.ticket_message_count = len(ticket.ticket_message_ids)
+            target = targets[ticket.category_id.id]
+            # Resolved/closed tickets only compare the stored duration
+            if ticket.state in TicketState.TERMINAL_STATES:
+                ticket.sla_resolution_status = _sla_final_status(ticket.sla_resolution_hours, target)
+            else:
+                elapsed = (now - ticket.create_date) / hour if ticket.create_date else None
+                ticket.sla_resolution_status = _sla_running_status(elapsed, target)
+
+    @api.model
+    def _add_ticket_message_counts(self, deltas):
+        """
+        Adjust stored message counts in one SQL statement.
+
+        Args:
+            deltas: Dict of ticket id -> number of messages added (negative
+                for removed messages)
+        """
+        deltas = {ticket_id: delta for ticket_id, delta in deltas.items() if ticket_id and delta}
+        if not deltas:
+            return
+        self.env.cr.execute(
+            """
+            UPDATE saas_ticket
+            SET ticket_message_count = ticket_message_count + data.delta
+            FROM (VALUES {values}) AS data(id, delta)
+            WHERE saas_ticket.id = data.id
+            """.format(values=', '.join(['(%s, %s)'] * len(deltas))),
+            [value for item in deltas.items() for value in item],
+        )
+        self.browse(deltas).invalidate_recordset(['ticket_message_count'])
 
     @api.model_create_multi
     def create(self, vals_list):
         """Override create to generate reference and set defaults."""
+        needing_reference = [
+            vals for vals in vals_list if vals.get('reference', 'New') == 'New'
+        ]
+        references = self._next_references(len(needing_reference))
+        for vals, reference in zip(needing_reference, references):
+            vals['reference'] = reference
+
         for vals in vals_list:
-            if vals.get('reference', 'New') == 'New':
-                vals['reference'] = self.env['ir.sequence'].next_by_code(
-                    'saas.ticket'
-                ) or 'New'
+            # Kanban color follows the priority
+            priority = vals.get('priority') or self.env.context.get(
+                'default_priority', TicketPriority.MEDIUM
+            )
+            vals['color'] = PRIORITY_COLORS.get(priority, 0)
 
             # Set default assignee from category
             if vals.get('category_id') and not vals.get('user_id'):
@@ -350,46 +445,113 @@ class SaasTicket(models.Model):
         tickets = super().create(vals_list)
 
         # Send auto-response email for each created ticket (T-134)
-        for ticket in tickets:
-            ticket._send_ticket_created_notification()
+        tickets._send_ticket_created_notification()
 
         return tickets
 
-    def _send_ticket_created_notification(self):
-        """Send auto-response email when ticket is created."""
-        self.ensure_one()
-        try:
-            template = self.env.ref(
-                'saas_helpdesk.mail_template_ticket_created',
-                raise_if_not_found=False
+    @api.model
+    def _next_references(self, count):
+        """
+        Allocate ticket references from the saas.ticket sequence.
+
+        For several tickets on a standard (PostgreSQL-backed) sequence, all
+        numbers are drawn with a single nextval() over generate_series.
+
+        Args:
+            count: Number of references needed
+
+        Returns:
+            list: References ('New' if no sequence is configured)
+        """
+        if not count:
+            return []
+
+        IrSequence = self.env['ir.sequence']
+        sequence = IrSequence.sudo().search([
+            ('code', '=', 'saas.ticket'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if count == 1 or not sequence or sequence.implementation != 'standard' \
+                or sequence.use_date_range:
+            return [IrSequence.next_by_code('saas.ticket') or 'New' for _i in range(count)]
+
+        self.env.cr.execute(
+            "SELECT nextval(%s::regclass) FROM generate_series(1, %s)",
+            (f'ir_sequence_{sequence.id:03d}', count),
+        )
+        return [sequence.get_next_char(number) for (number,) in self.env.cr.fetchall()]
+
+    @api.model
+    @tools.ormcache('xmlid', 'fallback_name')
+    def _get_template_id(self, xmlid, fallback_name):
+        """
+        Resolve a mail template id, cached per registry.
+
+        Args:
+            xmlid: XML ID of the template
+            fallback_name: Template name searched if the XML ID is missing
+
+        Returns:
+            int: Template id, or 0 if no template was found
+        """
+        template = self.env.ref(xmlid, raise_if_not_found=False)
+        if not template:
+            template = self.env['mail.template'].sudo().search(
+                [('name', '=', fallback_name)], limit=1
             )
-            if not template:
-                template = self.env['mail.template'].search(
-                    [('name', '=', 'SaaS Helpdesk: Ticket Created')], limit=1
+        return template.id or 0
+
+    def write(self, vals):
+        """Keep the kanban color in sync when the priority changes."""
+        if 'priority' in vals:
+            vals = dict(vals, color=PRIORITY_COLORS.get(vals['priority'], 0))
+        return super().write(vals)
+
+    def _send_notification(self, xmlid, fallback_name, label, force_send=True):
+        """
+        Send a templated email to the customer of each ticket.
+
+        Args:
+            xmlid: XML ID of the mail template
+            fallback_name: Template name searched if the XML ID is missing
+            label: Notification name for log messages
+            force_send: Send immediately instead of queueing for the mail cron
+        """
+        template_id = self._get_template_id(xmlid, fallback_name)
+        template = self.env['mail.template'].browse(template_id).exists()
+        if not template:
+            return
+        for ticket in self:
+            if not ticket.partner_id:
+                continue
+            try:
+                template.send_mail(ticket.id, force_send=force_send)
+                # Lazy %-formatting: no string building when INFO is filtered
+                _logger.info(
+                    "Ticket %s notification %s for %s",
+                    label, 'sent' if force_send else 'queued', ticket.reference,
                 )
-            if template and self.partner_id:
-                template.send_mail(self.id, force_send=True)
-                _logger.info(f"Ticket created notification sent for {self.reference}")
-        except Exception as e:
-            _logger.error(f"Failed to send ticket created notification: {e}")
+            except Exception as e:
+                _logger.error("Failed to send ticket %s notification: %s", label, e)
+
+    def _send_ticket_created_notification(self):
+        """Send auto-response email when ticket is created."""
+        self._send_notification(
+            'saas_helpdesk.mail_template_ticket_created',
+            'SaaS Helpdesk: Ticket Created',
+            'created',
+            # Queued: the mail cron delivers it outside of the transaction
+            force_send=False,
+        )
 
     def _send_ticket_resolved_notification(self):
         """Send notification when ticket is resolved."""
-        self.ensure_one()
-        try:
-            template = self.env.ref(
-                'saas_helpdesk.mail_template_ticket_resolved',
-                raise_if_not_found=False
-            )
-            if not template:
-                template = self.env['mail.template'].search(
-                    [('name', '=', 'SaaS Helpdesk: Ticket Resolved')], limit=1
-                )
-            if template and self.partner_id:
-                template.send_mail(self.id, force_send=True)
-                _logger.info(f"Ticket resolved notification sent for {self.reference}")
-        except Exception as e:
-            _logger.error(f"Failed to send ticket resolved notification: {e}")
+        self._send_notification(
+            'saas_helpdesk.mail_template_ticket_resolved',
+            'SaaS Helpdesk: Ticket Resolved',
+            'resolved',
+            force_send=False,
+        )
 
     @api.onchange('category_id')
     def _onchange_category_id(self):
@@ -408,77 +570,105 @@ class SaasTicket(models.Model):
                 }
             }
 
+    def _transition_target(self, action):
+        """
+        Look up the state reached by an action from the tickets' states.
+
+        Args:
+            action: Action key of the _TRANSITIONS table
+
+        Returns:
+            str or None: Target state, or None if any ticket forbids it
+        """
+        for ticket in self:
+            if (ticket.state, action) not in _TRANSITIONS:
+                return None
+        return _ACTION_TARGETS[action]
+
+    def _log_chatter(self, body):
+        """Log the same chatter note on every ticket with one batch insert."""
+        if self:
+            self._message_log_batch(bodies={ticket.id: body for ticket in self})
+
     def action_open(self):
-        """Mark ticket as open/acknowledged."""
-        self.ensure_one()
-        if self.state != TicketState.NEW:
+        """Mark tickets as open/acknowledged."""
+        state = self._transition_target('open')
+        if state is None:
             raise UserError(_("Can only open new tickets."))
-        self.write({'state': TicketState.OPEN})
-        self.message_post(body="Ticket opened and acknowledged.")
+        self.write({'state': state})
+        self._log_chatter("Ticket opened and acknowledged.")
 
     def action_start_progress(self):
-        """Start working on ticket."""
-        self.ensure_one()
-        if self.state not in [TicketState.NEW, TicketState.OPEN, TicketState.PENDING]:
+        """Start working on tickets."""
+        state = self._transition_target('start')
+        if state is None:
             raise UserError(_("Cannot start progress on this ticket."))
-        self.write({
-            'state': TicketState.IN_PROGRESS,
-            'user_id': self.user_id.id or self.env.user.id,
+        # Only assign unassigned tickets, avoiding no-op user_id writes
+        unassigned = self.filtered(lambda t: not t.user_id)
+        (self - unassigned).write({'state': state})
+        unassigned.write({
+            'state': state,
+            'user_id': self.env.user.id,
         })
-        self.message_post(body="Started working on ticket.")
+        self._log_chatter("Started working on ticket.")
 
     def action_pending(self):
         """Mark as pending customer response."""
-        self.ensure_one()
-        if self.state not in [TicketState.OPEN, TicketState.IN_PROGRESS]:
+        state = self._transition_target('pending')
+        if state is None:
             raise UserError(_("Cannot set pending on this ticket."))
-        self.write({'state': TicketState.PENDING})
-        self.message_post(body="Waiting for customer response.")
+        self.write({'state': state})
+        self._log_chatter("Waiting for customer response.")
 
     def action_resolve(self):
-        """Mark ticket as resolved."""
-        self.ensure_one()
-        if self.state in [TicketState.CLOSED, TicketState.CANCELLED]:
+        """Mark tickets as resolved."""
+        state = self._transition_target('resolve')
+        if state is None:
             raise UserError(_("Cannot resolve a closed or cancelled ticket."))
         self.write({
-            'state': TicketState.RESOLVED,
+            'state': state,
             'resolved_date': fields.Datetime.now(),
         })
-        self.message_post(body="Ticket marked as resolved.")
+        self._log_chatter("Ticket marked as resolved.")
         self._send_ticket_resolved_notification()
 
     def action_close(self):
-        """Close the ticket."""
-        self.ensure_one()
-        if self.state == TicketState.CANCELLED:
+        """Close the tickets."""
+        state = self._transition_target('close')
+        if state is None:
             raise UserError(_("Cannot close a cancelled ticket."))
-        self.write({
-            'state': TicketState.CLOSED,
-            'closed_date': fields.Datetime.now(),
+        now = fields.Datetime.now()
+        unresolved = self.filtered(lambda t: not t.resolved_date)
+        (self - unresolved).write({
+            'state': state,
+            'closed_date': now,
         })
-        if not self.resolved_date:
-            self.resolved_date = fields.Datetime.now()
-        self.message_post(body="Ticket closed.")
+        unresolved.write({
+            'state': state,
+            'closed_date': now,
+            'resolved_date': now,
+        })
+        self._log_chatter("Ticket closed.")
 
     def action_reopen(self):
-        """Reopen a resolved or closed ticket."""
-        self.ensure_one()
-        if self.state not in [TicketState.RESOLVED, TicketState.CLOSED]:
+        """Reopen resolved or closed tickets."""
+        state = self._transition_target('reopen')
+        if state is None:
             raise UserError(_("Can only reopen resolved or closed tickets."))
         self.write({
-            'state': TicketState.OPEN,
+            'state': state,
             'resolved_date': False,
             'closed_date': False,
         })
-        self.message_post(body="Ticket reopened.")
+        self._log_chatter("Ticket reopened.")
 
     def action_cancel(self):
-        """Cancel the ticket."""
-        self.ensure_one()
-        if self.state == TicketState.CLOSED:
+        """Cancel the tickets."""
+        state = self._transition_target('cancel')
+        if state is None:
             raise UserError(_("Cannot cancel a closed ticket."))
-        self.write({'state': TicketState.CANCELLED})
-        self.message_post(body="Ticket cancelled.")
+        self.write({'state': state})
+        self._log_chatter("Ticket cancelled.")
 
     def action_assign_to_me(self):
         """Assign ticket to current user."""
@@ -3,8 +3,12 @@
 Ticket Category model for organizing support tickets.
 """
 
+from collections import defaultdict
+
 from odoo import models, fields, api
 
+from .ticket import TicketState
+
 
 class TicketCategory(models.Model):
     """Support ticket category with SLA settings."""
@@ -94,13 +98,30 @@ class TicketCategory(models.Model):
 
     @api.depends('ticket_ids', 'ticket_ids.state')
     def _compute_ticket_count(self):
-        """Count tickets in this category."""
+        """
+        Count tickets in this category.
+
+        Uses a single _read_group query per (category, state) instead of
+        loading and filtering every ticket.
+        """
+        if not self:
+            return
+
+        data = self.env['saas.ticket']._read_group(
+            [('category_id', 'in', self.ids)],
+            groupby=['category_id', 'state'],
+            aggregates=['__count'],
+        )
+        total = defaultdict(int)
+        open_count = defaultdict(int)
+        for category, state, count in data:
+            total[category.id] += count
+            if state not in TicketState.INACTIVE_STATES:
+                open_count[category.id] += count
+
         for category in self:
-            tickets = category.ticket_ids
-            category.ticket_count = len(tickets)
-            category.open_ticket_count = len(tickets.filtered(
-                lambda t: t.state not in ['resolved', 'closed', 'cancelled']
-            ))
+            category.ticket_count = total[category.id]
+            category.open_ticket_count = open_count[category.id]
 
     def action_view_tickets(self):
         """View tickets in this category."""
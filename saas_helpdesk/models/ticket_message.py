@@ -3,6 +3,8 @@
 Ticket Message model for support ticket communications.
 """
 
+from collections import Counter, defaultdict
+
 from odoo import models, fields, api
 
 
@@ -75,9 +77,15 @@ class TicketMessage(models.Model):
         readonly=True,
     )
 
-    @api.depends('author_id', 'ticket_id.partner_id')
+    @api.depends('author_id', 'ticket_id')
     def _compute_is_customer_message(self):
-        """Check if message is from the customer."""
+        """
+        Check if message is from the customer.
+
+        Deliberately not depending on ticket_id.partner_id: the flag records
+        who wrote the message at the time, and changing a ticket's customer
+        must not recompute its whole message history.
+        """
         for message in self:
             if message.ticket_id and message.author_id:
                 message.is_customer_message = (
@@ -96,24 +104,71 @@ class TicketMessage(models.Model):
         """Override create to update ticket and track first response."""
         messages = super().create(vals_list)
 
+        self.env['saas.ticket']._add_ticket_message_counts(
+            Counter(message.ticket_id.id for message in messages)
+        )
+
+        # Group by ticket so each ticket gets a single write and one chatter
+        # post per subtype, however many messages are created at once
+        messages_by_ticket = defaultdict(list)
         for message in messages:
-            ticket = message.ticket_id
+            messages_by_ticket[message.ticket_id].append(message)
+
+        for ticket, ticket_messages in messages_by_ticket.items():
+            ticket_vals = {}
 
             # Update first response date if this is first staff response
-            if not message.is_customer_message and not ticket.first_response_date:
-                ticket.first_response_date = message.create_date
+            if not ticket.first_response_date:
+                staff_dates = [
+                    message.create_date for message in ticket_messages
+                    if not message.is_customer_message
+                ]
+                if staff_dates:
+                    ticket_vals['first_response_date'] = min(staff_dates)
 
             # If customer responds to pending ticket, move to open
-            if message.is_customer_message and ticket.state == 'pending':
-                ticket.write({'state': 'open'})
+            if ticket.state == 'pending' and any(
+                message.is_customer_message for message in ticket_messages
+            ):
+                ticket_vals['state'] = 'open'
+
+            if ticket_vals:
+                ticket.write(ticket_vals)
 
             # Post to chatter
-            body = f"<p><strong>{'Internal Note' if message.is_internal else 'Reply'}</strong> from {message.author_id.name}:</p>{message.body}"
-            subtype = 'mail.mt_note' if message.is_internal else 'mail.mt_comment'
-            ticket.message_post(body=body, subtype_xmlid=subtype)
+            bodies = defaultdict(list)
+            for message in ticket_messages:
+                bodies[message.is_internal].append(
+                    f"<p><strong>{'Internal Note' if message.is_internal else 'Reply'}</strong> from {message.author_id.name}:</p>{message.body}"
+                )
+            for is_internal, parts in bodies.items():
+                subtype = 'mail.mt_note' if is_internal else 'mail.mt_comment'
+                ticket.message_post(body=''.join(parts), subtype_xmlid=subtype)
 
         return messages
 
+    def write(self, vals):
+        """Move message counts along when messages change ticket."""
+        if 'ticket_id' not in vals:
+            return super().write(vals)
+
+        deltas = Counter()
+        for message in self:
+            deltas[message.ticket_id.id] -= 1
+        deltas[vals['ticket_id']] += len(self)
+        result = super().write(vals)
+        self.env['saas.ticket']._add_ticket_message_counts(deltas)
+        return result
+
+    def unlink(self):
+        """Decrement the message count of the tickets."""
+        deltas = Counter()
+        for message in self:
+            deltas[message.ticket_id.id] -= 1
+        result = super().unlink()
+        self.env['saas.ticket']._add_ticket_message_counts(deltas)
+        return result
+
     def action_view_attachments(self):
         """View attachments."""
         self.ensure_one()
@@ -7,12 +7,136 @@ Handles callbacks from tenant instances when support sessions end.
 
 import logging
 import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from string import Template
 
-from odoo import http, fields, SUPERUSER_ID, api
+from markupsafe import escape as html_escape
+
+from odoo import http, fields, SUPERUSER_ID
 from odoo.http import request
 
 _logger = logging.getLogger(__name__)
 
+# Session end notification, built once; values are HTML-escaped on use
+_SUBJECT_TMPL = Template("Support Session Ended: $instance_name")
+_BODY_HTML_TMPL = Template("""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #28a745;">Support Session Ended</h2>
+        <p>The support session for your Odoo instance has ended.</p>
+
+        <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
+            <tr>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>Instance:</strong></td>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;">$instance_name</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>Support Representative:</strong></td>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;">$support_name</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>Session Duration:</strong></td>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;">$duration minutes</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>End Reason:</strong></td>
+                <td style="padding: 8px; border-bottom: 1px solid #ddd;">$reason_text</td>
+            </tr>
+        </table>
+
+        <p style="color: #666; font-size: 12px;">
+            This notification is automatically generated for your security and audit purposes.
+            All support access is logged.
+        </p>
+
+        <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
+        <p style="color: #999; font-size: 11px;">
+            VedTech Solutions SaaS Platform
+        </p>
+    </div>
+    """)
+
+
+def _parse_end_time(value):
+    """
+    Parse the tenant's ISO end time into a naive UTC datetime.
+
+    Args:
+        value: ISO 8601 string, optionally suffixed with 'Z'
+
+    Returns:
+        datetime: Naive UTC datetime, or None if missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        # Common case: a 'Z' suffixed UTC timestamp is already naive UTC
+        # once the suffix is dropped
+        if value[-1] == 'Z':
+            end_dt = datetime.fromisoformat(value[:-1])
+            if not end_dt.tzinfo:
+                return end_dt
+        else:
+            end_dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        _logger.error(f"Failed to parse end time: {e}")
+        return None
+    # Columns are timestamp without time zone, stored in UTC
+    if end_dt.tzinfo:
+        end_dt = end_dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return end_dt
+
+
+@dataclass(slots=True, frozen=True)
+class SessionPayload:
+    """Session end callback payload, coerced once from the JSON-RPC params."""
+
+    session_id: str
+    master_uid: int
+    user_id: int
+    user_login: str
+    start_time: str
+    end_time: str
+    end_dt: datetime
+    duration_minutes: int
+    state: str
+
+    @classmethod
+    def from_kw(cls, kw):
+        """
+        Build the payload from the route keyword arguments.
+
+        Args:
+            kw: JSON-RPC params as passed to the route
+
+        Returns:
+            SessionPayload: Coerced payload
+
+        Raises:
+            ValueError: If a numeric param is not an integer
+        """
+        master_uid = kw.get('master_uid')
+        user_id = kw.get('user_id')
+        end_time = kw.get('end_time')
+        return cls(
+            session_id=kw.get('session_id'),
+            master_uid=int(master_uid) if master_uid else None,
+            user_id=int(user_id) if user_id else None,
+            user_login=kw.get('user_login'),
+            start_time=kw.get('start_time'),
+            end_time=end_time,
+            end_dt=_parse_end_time(end_time),
+            duration_minutes=int(kw.get('duration_minutes') or 0),
+            state=kw.get('state') or 'ended',
+        )
+
+    @property
+    def reason_text(self):
+        """Human readable end reason for the customer notification."""
+        if self.state == 'expired':
+            return 'Session timed out after 1 hour'
+        return 'Support logged out'
+
 
 class SessionCallbackController(http.Controller):
     """Controller for support session end callbacks."""
@@ -33,84 +157,94 @@ class SessionCallbackController(http.Controller):
         try:
             # For type='jsonrpc' routes, the params are passed as kwargs
             # The JSON-RPC params are already extracted by Odoo
-            data = kw
-
-            _logger.info(f"Session callback received for instance {instance_id}: {data}")
+            _logger.info(f"Session callback received for instance {instance_id}: {kw}")
+            payload = SessionPayload.from_kw(kw)
 
             # Process in sudo mode
             db = request.db
             if not db:
                 return {'success': False, 'error': 'No database'}
 
-            registry = request.env.registry
-            with registry.cursor() as cr:
-                env = api.Environment(cr, SUPERUSER_ID, {})
-
-                # Find the instance
-                instance = env['saas.instance'].browse(instance_id)
-                if not instance.exists():
-                    _logger.warning(f"Instance {instance_id} not found for callback")
-                    return {'success': False, 'error': 'Instance not found'}
-
-                # Extract session data
-                session_data = {
-                    'session_id': data.get('session_id'),
-                    'master_uid': data.get('master_uid'),
-                    'user_id': data.get('user_id'),
-                    'user_login': data.get('user_login'),
-                    'start_time': data.get('start_time'),
-                    'end_time': data.get('end_time'),
-                    'duration_minutes': data.get('duration_minutes', 0),
-                    'state': data.get('state', 'ended'),
-                }
-
-                # Update audit log
-                self._update_audit_log(env, instance, session_data)
-
-                # Send notification to customer
-                self._send_session_end_notification(env, instance, session_data)
-
-                _logger.info(f"Session callback processed for instance {instance_id}")
-                return {'success': True}
+            # Use the request's own transaction as superuser; the dispatcher
+            # commits it when the route returns
+            env = request.env(user=SUPERUSER_ID)
 
-        except Exception as e:
-            _logger.error(f"Session callback failed: {e}")
-            import traceback
-            _logger.error(traceback.format_exc())
-            return {'success': False, 'error': str(e)}
+            # Find the instance; exists() only selects the id, and with
+            # prefetching off the few fields used below are read one by one
+            # instead of loading every stored column of the instance
+            instance = env['saas.instance'].with_context(prefetch_fields=False).browse(instance_id)
+            if not instance.exists():
+                _logger.warning(f"Instance {instance_id} not found for callback")
+                return {'success': False, 'error': 'Instance not found'}
 
-    def _update_audit_log(self, env, instance, session_data):
+            # Update audit log
+            self._update_audit_log(env, instance, payload)
+
+            # Send notification to customer
+            self._send_session_end_notification(env, instance, payload)
+
+            _logger.info(f"Session callback processed for instance {instance_id}")
+            return {'success': True}
+
+        except Exception:
+            _logger.exception("Session callback failed for instance %s", instance_id)
+            # Details stay in the server log, not in the tenant's response
+            return {'success': False, 'error': 'internal'}
+
+    def _update_audit_log(self, env, instance, payload):
         """Update the support access log with session end info."""
+        # A missing or malformed end time never reaches the database
+        end_dt = payload.end_dt
+        if not end_dt:
+            return
+
         try:
-            # Find the most recent access log for this instance
+            # Stamp the most recent access log for this instance and support
+            # user in a single statement; IS NOT DISTINCT FROM keeps a
+            # missing master_uid matching logs without a user, like the
+            # ORM's ('accessed_by_id', '=', None)
             AccessLog = env['saas.support.access.log']
-            log = AccessLog.search([
-                ('instance_id', '=', instance.id),
-                ('accessed_by_id', '=', session_data.get('master_uid')),
-            ], limit=1, order='access_time desc')
-
-            if log:
-                # Update with session end info
-                end_time = session_data.get('end_time')
-                if end_time:
-                    try:
-                        from datetime import datetime
-                        end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-                        log.write({
-                            'session_end_time': end_dt,
-                            'session_duration_minutes': session_data.get('duration_minutes', 0),
-                            'session_end_reason': session_data.get('state', 'ended'),
-                        })
-                        _logger.info(f"Updated access log {log.id} with session end info")
-                    except Exception as e:
-                        _logger.error(f"Failed to parse end time: {e}")
+            # The raw UPDATE bypasses the ORM's selection check, and the
+            # state comes from an unauthenticated tenant request
+            end_reason = payload.state
+            if end_reason not in AccessLog._fields['session_end_reason'].get_values(env):
+                end_reason = 'unknown'
+            AccessLog.flush_model(['instance_id', 'accessed_by_id', 'access_time'])
+            env.cr.execute("""
+                UPDATE saas_support_access_log
+                   SET session_end_time = %s,
+                       session_duration_minutes = %s,
+                       session_end_reason = %s,
+                       write_uid = %s,
+                       write_date = (now() at time zone 'UTC')
+                 WHERE id = (
+                       SELECT id FROM saas_support_access_log
+                        WHERE instance_id = %s AND accessed_by_id IS NOT DISTINCT FROM %s
+                     ORDER BY access_time DESC NULLS LAST
+                        LIMIT 1
+                 )
+             RETURNING id
+            """, (
+                end_dt,
+                payload.duration_minutes,
+                end_reason,
+                env.uid,
+                instance.id,
+                payload.master_uid,
+            ))
+            row = env.cr.fetchone()
+            if row:
+                AccessLog.browse(row[0]).invalidate_recordset([
+                    'session_end_time', 'session_duration_minutes', 'session_end_reason',
+                ])
+                _logger.info(f"Updated access log {row[0]} with session end info")
             else:
                 _logger.warning(f"No access log found for instance {instance.id}")
 
         except Exception as e:
             _logger.error(f"Failed to update audit log: {e}")
 
-    def _send_session_end_notification(self, env, instance, session_data):
+    def _send_session_end_notification(self, env, instance, payload):
         """Send email to customer when support session ends."""
         try:
             # Get decrypted email (admin_email is an encrypted field)
@@ -120,53 +254,16 @@ class SessionCallbackController(http.Controller):
                 return
 
             # Get support user name
-            support_user = env['res.users'].browse(session_data.get('master_uid'))
+            support_user = env['res.users'].browse(payload.master_uid)
             support_name = support_user.name if support_user.exists() else 'Support Team'
 
-            duration = session_data.get('duration_minutes', 0)
-            end_reason = session_data.get('state', 'ended')
-
-            if end_reason == 'expired':
-                reason_text = 'Session timed out after 1 hour'
-            else:
-                reason_text = 'Support logged out'
-
-            subject = f"Support Session Ended: {instance.name}"
-            body_html = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #28a745;">Support Session Ended</h2>
-                <p>The support session for your Odoo instance has ended.</p>
-
-                <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
-                    <tr>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>Instance:</strong></td>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;">{instance.name}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>Support Representative:</strong></td>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;">{support_name}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>Session Duration:</strong></td>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;">{duration} minutes</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;"><strong>End Reason:</strong></td>
-                        <td style="padding: 8px; border-bottom: 1px solid #ddd;">{reason_text}</td>
-                    </tr>
-                </table>
-
-                <p style="color: #666; font-size: 12px;">
-                    This notification is automatically generated for your security and audit purposes.
-                    All support access is logged.
-                </p>
-
-                <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-                <p style="color: #999; font-size: 11px;">
-                    VedTech Solutions SaaS Platform
-                </p>
-            </div>
-            """
+            subject = _SUBJECT_TMPL.substitute(instance_name=instance.name)
+            body_html = _BODY_HTML_TMPL.substitute(
+                instance_name=html_escape(instance.name),
+                support_name=html_escape(support_name),
+                duration=payload.duration_minutes,
+                reason_text=payload.reason_text,
+            )
 
             mail_values = {
                 'subject': subject,
@@ -175,10 +272,11 @@ class SessionCallbackController(http.Controller):
                 'email_from': env.company.email or 'noreply@vedtechsolutions.com',
                 'auto_delete': True,
             }
-            mail = env['mail.mail'].create(mail_values)
-            mail.send()
+            # Queued only: the mail queue cron delivers it, so the tenant's
+            # callback does not wait on SMTP
+            env['mail.mail'].create(mail_values)
 
-            _logger.info(f"Session end notification sent to {customer_email}")
+            _logger.info(f"Session end notification queued for {customer_email}")
 
         except Exception as e:
             _logger.error(f"Failed to send session end notification: {e}")
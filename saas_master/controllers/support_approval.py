@@ -5,13 +5,109 @@ Support Access Approval Controller.
 Handles public endpoints for customers to approve/deny support access requests.
 """
 
+import hmac
 import logging
+import re
+import threading
+import time
 
 from odoo import http, fields, SUPERUSER_ID, api
+from odoo.exceptions import MissingError
 from odoo.http import request
 
 _logger = logging.getLogger(__name__)
 
+# Approval tokens are secrets.token_urlsafe() output; anything else is
+# rejected before touching the database
+_TOKEN_RE = re.compile(r'\A[A-Za-z0-9_-]{32,128}\Z')
+
+# Process-local cache of approval token lookups: (dbname, token) -> (expires, id)
+# Only the id is cached; the record itself is always re-read and re-verified.
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_TTL = 300  # seconds
+_TOKEN_CACHE_MAX = 1024
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def _find_access_request(token):
+    """
+    Find a support access request by approval token.
+
+    The GET page and the confirm POST of one approval resolve the same
+    token, so the id found by the first is reused by the second.
+
+    Args:
+        token: Approval token from the URL
+
+    Returns:
+        saas.support.access.request: Matching record (sudo), or empty
+    """
+    AccessRequest = request.env['saas.support.access.request'].sudo()
+    key = (request.env.cr.dbname, token)
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+    if cached and cached[0] > time.monotonic():
+        # Reading the token loads the record by primary key in one query
+        access_request = AccessRequest.browse(cached[1])
+        try:
+            if hmac.compare_digest(access_request.approval_token or '', token):
+                return access_request
+        except MissingError:
+            pass
+        _forget_token(token)
+
+    access_request = AccessRequest.search([('approval_token', '=', token)], limit=1)
+    if access_request:
+        with _TOKEN_CACHE_LOCK:
+            now = time.monotonic()
+            if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+                for stale in [k for k, (expires, _id) in _TOKEN_CACHE.items() if expires <= now]:
+                    del _TOKEN_CACHE[stale]
+                if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+                    _TOKEN_CACHE.clear()
+            _TOKEN_CACHE[key] = (now + _TOKEN_CACHE_TTL, access_request.id)
+    return access_request
+
+
+def _forget_token(token):
+    """Drop a token from the lookup cache once its request is processed."""
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE.pop((request.env.cr.dbname, token), None)
+
+
+# Rendered static pages: (dbname, lang, template) -> (expires, html)
+_PAGE_CACHE = {}
+_PAGE_CACHE_TTL = 300  # seconds
+
+
+def _static_page(template, values=None):
+    """
+    Serve a page whose content does not depend on the request.
+
+    The invalid and expired pages only show fixed text, so they are
+    rendered once per database and language and reused for a few
+    minutes. The response itself is marked no-store.
+
+    Args:
+        template: XML id of the QWeb template
+        values: Constant rendering values
+
+    Returns:
+        Response: HTML response
+    """
+    key = (request.env.cr.dbname, request.env.lang, template)
+    now = time.monotonic()
+    cached = _PAGE_CACHE.get(key)
+    if cached and cached[0] > now:
+        html = cached[1]
+    else:
+        html = request.env['ir.ui.view'].sudo()._render_template(template, values or {})
+        _PAGE_CACHE[key] = (now + _PAGE_CACHE_TTL, html)
+    return request.make_response(html, headers=[
+        ('Content-Type', 'text/html; charset=utf-8'),
+        ('Cache-Control', 'no-store'),
+    ])
+
 
 class SupportApprovalController(http.Controller):
     """Controller for support access approval workflow."""
@@ -24,12 +120,10 @@ class SupportApprovalController(http.Controller):
         Shows request details and approve/deny buttons.
         """
         # Find the request by token
-        access_request = request.env['saas.support.access.request'].sudo().search([
-            ('approval_token', '=', token),
-        ], limit=1)
+        access_request = _find_access_request(token) if _TOKEN_RE.match(token) else None
 
         if not access_request:
-            return request.render('saas_master.support_approval_invalid', {
+            return _static_page('saas_master.support_approval_invalid', {
                 'error': 'Invalid or expired approval link.',
             })
 
@@ -43,9 +137,7 @@ class SupportApprovalController(http.Controller):
         # Check if expired
         if fields.Datetime.now() > access_request.token_expiry:
             access_request.state = 'expired'
-            return request.render('saas_master.support_approval_expired', {
-                'access_request': access_request,
-            })
+            return _static_page('saas_master.support_approval_expired')
 
         # Show approval page
         return request.render('saas_master.support_approval_page', {
@@ -58,12 +150,12 @@ class SupportApprovalController(http.Controller):
         """
         Process the approval or denial.
         """
-        access_request = request.env['saas.support.access.request'].sudo().search([
-            ('approval_token', '=', token),
-            ('state', '=', 'pending'),
-        ], limit=1)
+        if not _TOKEN_RE.match(token):
+            return request.not_found()
 
-        if not access_request:
+        access_request = _find_access_request(token)
+
+        if not access_request or access_request.state != 'pending':
             return request.redirect('/support/approve/' + token)
 
         # Check expiry
@@ -71,6 +163,9 @@ class SupportApprovalController(http.Controller):
             access_request.state = 'expired'
             return request.redirect('/support/approve/' + token)
 
+        # The token is single use
+        _forget_token(token)
+
         if action == 'approve':
             access_request.action_approve()
             return request.render('saas_master.support_approval_success', {
@@ -6,6 +6,9 @@ Manages customer Odoo instances running as Docker containers.
 """
 
 import logging
+import os
+import threading
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
 
@@ -23,6 +26,27 @@ from odoo.addons.saas_core.utils.db_utils import validate_savepoint_name
 
 _logger = logging.getLogger(__name__)
 
+# Tenant container settings shared by every instance
+# Use Docker bridge gateway for DB connection from container
+_BASE_DOCKER_ENV = {
+    'HOST': '0.0.0.0',
+    'PORT': '8069',
+    'DB_HOST': 'host.docker.internal',
+    'DB_PORT': '5432',
+    'DB_USER': 'odoo',
+    'DB_PASSWORD': 'odoo',
+    'DB_MAXCONN': '8',  # Limit DB connections to prevent PostgreSQL overload
+    'INIT_DATABASE': 'true',  # Initialize database with base module
+}
+_DOCKER_RESTART_POLICY = {'Name': 'unless-stopped'}
+_DOCKER_EXTRA_HOSTS = {'host.docker.internal': 'host-gateway'}
+
+# Process-wide Docker clients: (dbname, server id) -> (base_url, DockerClient)
+# Reusing a client keeps its HTTP connection pool alive across calls.
+_DOCKER_CLIENTS = {}
+_DOCKER_CLIENTS_LOCK = threading.Lock()
+_DOCKER_CLIENTS_PID = os.getpid()
+
 
 class SaasInstance(models.Model):
     """Customer Odoo instance running as a Docker container."""
@@ -73,7 +97,7 @@ class SaasInstance(models.Model):
     )
     full_domain = fields.Char(
         string=FieldLabels.FULL_DOMAIN,
-        compute='_compute_full_domain',
+        compute='_compute_subdomain_derivatives',
         store=True,
         help='Complete domain name for accessing the instance',
     )
@@ -109,7 +133,7 @@ class SaasInstance(models.Model):
         string=FieldLabels.SERVER,
         tracking=True,
         ondelete='restrict',
-        index=True,
+        index='btree_not_null',
     )
 
     # Docker configuration
@@ -121,12 +145,12 @@ class SaasInstance(models.Model):
     )
     container_name = fields.Char(
         string='Container Name',
-        compute='_compute_container_name',
+        compute='_compute_subdomain_derivatives',
         store=True,
     )
     database_name = fields.Char(
         string='Database Name',
-        compute='_compute_database_name',
+        compute='_compute_subdomain_derivatives',
         store=True,
     )
 
@@ -231,30 +255,18 @@ class SaasInstance(models.Model):
     )
 
     @api.depends(FieldNames.SUBDOMAIN)
-    def _compute_full_domain(self):
-        """Compute full domain from subdomain."""
+    def _compute_subdomain_derivatives(self):
+        """Compute full domain, Docker container name and database name from subdomain."""
+        suffix = DomainConfig.TENANT_SUBDOMAIN_SUFFIX
         for instance in self:
-            if instance.subdomain:
-                instance.full_domain = f"{instance.subdomain}.{DomainConfig.TENANT_SUBDOMAIN_SUFFIX}"
+            subdomain = instance.subdomain
+            if subdomain:
+                instance.full_domain = f"{subdomain}.{suffix}"
+                instance.container_name = generate_container_name(subdomain)
+                instance.database_name = generate_database_name(subdomain)
             else:
                 instance.full_domain = False
-
-    @api.depends(FieldNames.SUBDOMAIN)
-    def _compute_container_name(self):
-        """Compute Docker container name."""
-        for instance in self:
-            if instance.subdomain:
-                instance.container_name = generate_container_name(instance.subdomain)
-            else:
                 instance.container_name = False
-
-    @api.depends(FieldNames.SUBDOMAIN)
-    def _compute_database_name(self):
-        """Compute PostgreSQL database name."""
-        for instance in self:
-            if instance.subdomain:
-                instance.database_name = generate_database_name(instance.subdomain)
-            else:
                 instance.database_name = False
 
     @api.depends('port_http')
@@ -281,9 +293,11 @@ class SaasInstance(models.Model):
         These are used in email templates where direct field access
         would return encrypted values (ENC::...).
         """
+        values = self._origin._get_decrypted_values(['admin_email', 'admin_password'])
         for instance in self:
-            instance.admin_email_plain = instance._get_decrypted_value('admin_email')
-            instance.admin_password_plain = instance._get_decrypted_value('admin_password')
+            plain = values.get(instance._origin.id, {})
+            instance.admin_email_plain = plain.get('admin_email', False)
+            instance.admin_password_plain = plain.get('admin_password', False)
 
     @api.constrains(FieldNames.SUBDOMAIN)
     def _check_subdomain(self):
@@ -296,19 +310,14 @@ class SaasInstance(models.Model):
     def _check_admin_email(self):
         """Validate admin email format.
 
-        Note: admin_email is encrypted by the encryption mixin, so we need to
-        get the decrypted value for validation.
+        Note: admin_email is encrypted by the encryption mixin, so the
+        values are decrypted in one batch, and each distinct address is
+        validated once (bulk writes usually set the same address).
         """
-        from odoo.addons.saas_core.utils.encryption import is_encrypted
-
-        for instance in self:
-            if instance.admin_email:
-                # Get decrypted value since admin_email is in _encrypted_fields
-                email = instance.admin_email
-                if is_encrypted(email):
-                    email = instance._get_decrypted_value('admin_email')
-                if email:
-                    normalize_email(email)
+        values = self._get_decrypted_values(['admin_email'])
+        emails = {vals['admin_email'] for vals in values.values() if vals['admin_email']}
+        for email in emails:
+            normalize_email(email)
 
     @api.onchange(FieldNames.SUBDOMAIN)
     def _onchange_subdomain(self):
@@ -332,34 +341,48 @@ class SaasInstance(models.Model):
     # CRUD Overrides - Ensure server counts are updated
     # -------------------------------------------------------------------------
 
+    def _schedule_server_count_refresh(self, servers):
+        """
+        Refresh the instance counts of servers once, before the next commit.
+
+        Server ids are collected in the cursor's precommit data, so any
+        number of creates and writes in one transaction refresh each
+        affected server a single time, in the same transaction.
+
+        Args:
+            servers: saas.tenant.server records to refresh
+        """
+        if not servers:
+            return
+        data = self.env.cr.precommit.data
+        dirty = data.get('saas.instance.dirty_servers')
+        if dirty is None:
+            dirty = data['saas.instance.dirty_servers'] = set()
+            env = self.env
+
+            @self.env.cr.precommit.add
+            def refresh_server_counts():
+                server_ids = data.pop('saas.instance.dirty_servers', ())
+                env[ModelNames.SERVER].browse(server_ids).exists().refresh_instance_counts()
+        dirty.update(servers.ids)
+
     @api.model_create_multi
     def create(self, vals_list):
         """Override create to update server instance counts."""
         records = super().create(vals_list)
         # Update server counts for all affected servers
-        servers = records.mapped('server_id')
-        if servers:
-            servers.refresh_instance_counts()
+        self._schedule_server_count_refresh(records.server_id)
         return records
 
     def write(self, vals):
         """Override write to update server instance counts when state or server changes."""
-        # Track servers that need updating (before and after change)
-        servers_to_update = self.env[ModelNames.SERVER]
-
-        if 'state' in vals or 'server_id' in vals:
-            # Collect current servers before the change
-            servers_to_update |= self.mapped('server_id')
+        if 'state' not in vals and 'server_id' not in vals:
+            return super().write(vals)
 
+        # Track servers that need updating (before and after change)
+        servers_to_update = self.server_id
         result = super().write(vals)
-
-        if 'state' in vals or 'server_id' in vals:
-            # Collect servers after the change
-            servers_to_update |= self.mapped('server_id')
-            # Update all affected servers
-            if servers_to_update:
-                servers_to_update.refresh_instance_counts()
-
+        self._schedule_server_count_refresh(servers_to_update | self.server_id)
         return result
 
     def unlink(self):
@@ -370,11 +393,17 @@ class SaasInstance(models.Model):
         # Check for active subscriptions before allowing deletion
         Subscription = self.env.get('saas.subscription')
         if Subscription is not None:
-            for instance in self:
-                active_subs = Subscription.search([
-                    ('instance_id', '=', instance.id),
+            # One grouped query for the whole recordset
+            subs_by_instance = dict(Subscription._read_group(
+                [
+                    ('instance_id', 'in', self.ids),
                     ('state', 'in', ['active', 'trial', 'past_due', 'suspended']),
-                ])
+                ],
+                groupby=['instance_id'],
+                aggregates=['id:recordset'],
+            ))
+            for instance in self:
+                active_subs = subs_by_instance.get(instance)
                 if active_subs:
                     raise UserError(_(
                         "Cannot delete instance '%s' - it has %d active subscription(s): %s. "
@@ -385,11 +414,8 @@ class SaasInstance(models.Model):
                         ', '.join(active_subs.mapped('reference'))
                     ))
 
-        servers = self.mapped('server_id')
-        result = super().unlink()
-        if servers:
-            servers.refresh_instance_counts()
-        return result
+        self._schedule_server_count_refresh(self.server_id)
+        return super().unlink()
 
     # State transition methods
     def action_provision(self):
@@ -484,15 +510,149 @@ class SaasInstance(models.Model):
         return task
 
     def _get_docker_client(self):
-        """Get Docker client for the tenant server."""
+        """
+        Get the Docker client for the tenant server.
+
+        Clients are cached per server and process, so consecutive calls
+        reuse the same keep-alive connections. A client is replaced when
+        the server's Docker API URL changes, and the cache is dropped in
+        forked worker processes.
+        """
+        global _DOCKER_CLIENTS_PID
         import docker
         if not self.server_id or not self.server_id.docker_api_url:
             raise UserError(_("No Docker API URL configured for server"))
-        return docker.DockerClient(base_url=self.server_id.docker_api_url, timeout=60)
+
+        base_url = self.server_id.docker_api_url
+        key = (self.env.cr.dbname, self.server_id.id)
+        stale = None
+        with _DOCKER_CLIENTS_LOCK:
+            if _DOCKER_CLIENTS_PID != os.getpid():
+                # Connections inherited from the parent must not be shared
+                _DOCKER_CLIENTS.clear()
+                _DOCKER_CLIENTS_PID = os.getpid()
+            cached = _DOCKER_CLIENTS.get(key)
+            if cached and cached[0] == base_url:
+                return cached[1]
+            client = docker.DockerClient(base_url=base_url, timeout=60)
+            _DOCKER_CLIENTS[key] = (base_url, client)
+            if cached:
+                stale = cached[1]
+        if stale is not None:
+            try:
+                stale.close()
+            except Exception as e:
+                _logger.debug(f"Closing stale Docker client failed: {e}")
+        return client
+
+    def _wait_until(self, check, timeout, what):
+        """
+        Poll a readiness check with exponential backoff.
+
+        Sleeps 0.25s, 0.5s, 1s, then 2s between attempts until the check
+        passes or the timeout is reached.
+
+        Args:
+            check: Callable returning True once ready; exceptions count as
+                not ready
+            timeout: Maximum wait in seconds
+            what: Description used in the timeout warning
+
+        Returns:
+            bool: True if ready, False on timeout
+        """
+        import time
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        while True:
+            try:
+                if check():
+                    return True
+            except Exception as e:
+                _logger.debug(f"Waiting for {what} of {self.subdomain}: {e}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _logger.warning(f"Timed out after {timeout}s waiting for {what} of {self.subdomain}")
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 2)
+
+    def _wait_container_ready(self, container, timeout=30):
+        """
+        Wait until a container is running, and healthy if it has a healthcheck.
+
+        Args:
+            container: docker Container object
+            timeout: Maximum wait in seconds
+
+        Returns:
+            bool: True if ready, False on timeout
+        """
+        def ready():
+            container.reload()
+            state = container.attrs.get('State', {})
+            if not state.get('Running'):
+                return False
+            health = state.get('Health')
+            return not health or health.get('Status') == 'healthy'
+
+        return self._wait_until(ready, timeout, 'container start')
+
+    def _wait_tenant_db_ready(self, container, timeout=60):
+        """
+        Wait until the tenant database has been initialized with its admin user.
+
+        Args:
+            container: docker Container object
+            timeout: Maximum wait in seconds
+
+        Returns:
+            bool: True if ready, False on timeout
+        """
+        check_script = (
+            "import psycopg2\n"
+            f"conn = psycopg2.connect(host='host.docker.internal', dbname='{self.database_name}', "
+            "user='odoo', password='odoo')\n"
+            "cur = conn.cursor()\n"
+            "cur.execute(\"SELECT 1 FROM res_users WHERE login = 'admin'\")\n"
+            "print('DB_READY' if cur.fetchone() else 'DB_PENDING')\n"
+            "conn.close()\n"
+        )
+        cmd = ['/opt/odoo/venv/bin/python3', '-c', check_script]
+
+        def ready():
+            exit_code, output = container.exec_run(cmd, demux=False)
+            return exit_code == 0 and b'DB_READY' in (output or b'')
+
+        return self._wait_until(ready, timeout, 'database initialization')
+
+    def _progress(self, message):
+        """
+        Publish an intermediate provisioning step.
+
+        The status message is shown on the instance form and in the customer
+        portal while provisioning runs. It is written and committed through
+        a separate short-lived cursor, so the provisioning transaction itself
+        is not committed. Progress is best effort: should that transaction
+        hold the instance row, the update gives up after a short lock
+        timeout instead of waiting for it.
+
+        Args:
+            message: Human readable step description
+        """
+        _logger.info(f"Provisioning {self.subdomain}: {message}")
+        try:
+            with self.env.registry.cursor() as progress_cr:
+                progress_cr.execute("SET LOCAL lock_timeout = '1s'")
+                self.with_env(self.env(cr=progress_cr)).write({'status_message': message})
+                progress_cr.commit()
+        except Exception as e:
+            _logger.debug(f"Could not publish provisioning progress for {self.subdomain}: {e}")
 
     def _do_provision(self):
         """Execute the actual provisioning steps."""
         self.ensure_one()
+        container_id = False
         try:
             self.write({
                 'state': InstanceState.PROVISIONING,
@@ -502,7 +662,18 @@ class SaasInstance(models.Model):
 
             _logger.info(f"Provisioning instance {self.subdomain}")
 
+            # Load everything provisioning reads up front, one query per model
+            self.fetch([
+                'subdomain', 'container_name', 'database_name',
+                'port_http', 'port_longpolling', 'plan_id', 'partner_id', 'server_id',
+            ])
+            plan = self.plan_id
+            plan.fetch(['ram_limit_mb', 'cpu_limit', 'code'])
+            self.server_id.fetch(['docker_api_url', 'vpn_ip', 'docker_api_port'])
+            customer_name = self.partner_id.name
+
             # Get Docker client
+            import docker
             client = self._get_docker_client()
 
             # Generate admin password if not set
@@ -514,22 +685,12 @@ class SaasInstance(models.Model):
                 _logger.info(f"Generated admin password for {self.subdomain}")
 
             # Container environment variables
-            # Use Docker bridge gateway for DB connection from container
-            env_vars = {
-                'HOST': '0.0.0.0',
-                'PORT': '8069',
-                'DB_HOST': 'host.docker.internal',
-                'DB_PORT': '5432',
-                'DB_USER': 'odoo',
-                'DB_PASSWORD': 'odoo',
+            env_vars = _BASE_DOCKER_ENV | {
                 'DB_NAME': self.database_name,
-                'DB_MAXCONN': '8',  # Limit DB connections to prevent PostgreSQL overload
                 'ADMIN_PASSWD': self.admin_password or 'admin',
-                'INIT_DATABASE': 'true',  # Initialize database with base module
             }
 
             # Resource limits from plan
-            plan = self.plan_id
             mem_limit = f"{plan.ram_limit_mb}m"
             cpu_quota = int(plan.cpu_limit * 100000)  # Docker CPU quota
 
@@ -550,65 +711,84 @@ class SaasInstance(models.Model):
                     _logger.debug(f"Container check for {self.container_name}: {e}")
 
             # Create and start container
-            self.write({'status_message': 'Starting container...'})
-            self.env.cr.commit()
+            self._progress('Starting container...')
 
-            container = client.containers.run(
-                image=ServerConfig.DOCKER_IMAGE,
+            # Create and start through the low-level API: containers.run()
+            # would inspect the new container before returning it, while the
+            # readiness wait below reloads its state anyway
+            api_client = client.api
+            create_kwargs = dict(
                 name=self.container_name,
                 detach=True,
-                ports=ports,
+                # (port, protocol) tuples, as containers.run() passes them;
+                # plain '8069/tcp' strings would get a second '/tcp' suffix
+                ports=[tuple(port.split('/', 1)) for port in ports],
                 environment=env_vars,
-                mem_limit=mem_limit,
-                cpu_quota=cpu_quota,
-                restart_policy={'Name': 'unless-stopped'},
-                extra_hosts={'host.docker.internal': 'host-gateway'},
+                host_config=api_client.create_host_config(
+                    port_bindings=ports,
+                    mem_limit=mem_limit,
+                    cpu_quota=cpu_quota,
+                    restart_policy=_DOCKER_RESTART_POLICY,
+                    extra_hosts=_DOCKER_EXTRA_HOSTS,
+                ),
                 labels={
                     'saas.instance': self.subdomain,
                     'saas.plan': plan.code,
-                    'saas.customer': self.partner_id.name,
+                    'saas.customer': customer_name,
                 },
             )
+            try:
+                created = api_client.create_container(ServerConfig.DOCKER_IMAGE, **create_kwargs)
+            except docker.errors.ImageNotFound:
+                client.images.pull(ServerConfig.DOCKER_IMAGE)
+                created = api_client.create_container(ServerConfig.DOCKER_IMAGE, **create_kwargs)
+            api_client.start(created['Id'])
+            container = client.containers.prepare_model({'Id': created['Id']})
 
-            # Store container ID
-            self.write({
-                'container_id': container.id[:12],
-                'status_message': 'Container started, initializing database...',
-            })
-            self.env.cr.commit()
+            # The container ID is stored with the final state, so this
+            # transaction leaves the instance row unlocked for _progress()
+            container_id = container.id[:12]
+            self._progress('Container started, initializing database...')
 
-            _logger.info(f"Container {self.container_name} created with ID {container.id[:12]}")
+            _logger.info(f"Container {self.container_name} created with ID {container_id}")
 
             # Wait for container to be ready
-            import time
-            time.sleep(5)
+            self._wait_container_ready(container)
 
-            # Configure db_maxconn to prevent PostgreSQL connection overload
+            # Configure db_maxconn to prevent PostgreSQL connection overload.
+            # DB_MAXCONN is also in the environment; pinning it in odoo.conf
+            # keeps it when the image's entrypoint ignores that variable.
             try:
-                container.exec_run([
+                # sed exits 0 even when nothing matches, so append the line
+                # when it is missing and verify the result
+                exit_code, output = container.exec_run([
                     'bash', '-c',
-                    "sed -i 's/db_maxconn = .*/db_maxconn = 8/' /etc/odoo/odoo.conf || "
-                    "echo 'db_maxconn = 8' >> /etc/odoo/odoo.conf"
+                    "if grep -q '^db_maxconn' /etc/odoo/odoo.conf; then "
+                    "sed -i 's/^db_maxconn *=.*/db_maxconn = 8/' /etc/odoo/odoo.conf; "
+                    "else echo 'db_maxconn = 8' >> /etc/odoo/odoo.conf; fi && "
+                    "grep -qx 'db_maxconn = 8' /etc/odoo/odoo.conf"
                 ])
-                _logger.info(f"Set db_maxconn=8 for {self.container_name}")
+                if exit_code == 0:
+                    _logger.info(f"Set db_maxconn=8 for {self.container_name}")
+                else:
+                    _logger.warning(
+                        f"Could not set db_maxconn for {self.container_name}: "
+                        f"exit={exit_code}, output={(output or b'').decode(errors='replace')[:200]}"
+                    )
             except Exception as e:
                 _logger.warning(f"Could not set db_maxconn: {e}")
 
             # Add nginx proxy mapping
-            self.write({'status_message': 'Configuring proxy...'})
-            self.env.cr.commit()
+            self._progress('Configuring proxy...')
             self._add_nginx_mapping()
 
             # Request SSL certificate
-            self.write({'status_message': 'Requesting SSL certificate...'})
-            self.env.cr.commit()
+            self._progress('Requesting SSL certificate...')
             self._request_ssl_certificate()
 
             # Wait for database to be fully initialized
-            self.write({'status_message': 'Setting up admin credentials...'})
-            self.env.cr.commit()
-            import time
-            time.sleep(10)  # Give Odoo time to fully initialize the database
+            self._progress('Setting up admin credentials...')
+            self._wait_tenant_db_ready(container)
 
             # Set admin password and email in tenant database
             # Must use _get_decrypted_value since self.admin_password may return encrypted value
@@ -622,8 +802,7 @@ class SaasInstance(models.Model):
             self._fetch_tenant_admin_login()
 
             # Install support module for one-click support access
-            self.write({'status_message': 'Installing support module...'})
-            self.env.cr.commit()
+            self._progress('Installing support module...')
             support_installed = self._install_support_module()
             if not support_installed:
                 _logger.warning(f"Support module not installed on {self.subdomain} - support access may not work")
@@ -633,20 +812,20 @@ class SaasInstance(models.Model):
                 'state': InstanceState.RUNNING,
                 'status_message': 'Instance is running',
                 'provisioned_date': fields.Datetime.now(),
+                'container_id': container_id,
             })
 
-            # Refresh server instance counts
-            if self.server_id:
-                self.server_id.refresh_instance_counts()
-
             _logger.info(f"Instance {self.subdomain} provisioned successfully")
 
         except Exception as e:
             _logger.error(f"Provisioning failed for {self.subdomain}: {e}")
-            self.write({
+            vals = {
                 'state': InstanceState.ERROR,
                 'status_message': str(e),
-            })
+            }
+            if container_id:
+                vals['container_id'] = container_id
+            self.write(vals)
             self.env.cr.commit()  # Ensure error state is persisted
             # Re-raise so queue task is marked as failed
             raise
@@ -824,19 +1003,13 @@ class SaasInstance(models.Model):
                 except Exception as e:
                     _logger.warning(f"Could not remove container: {e}")
 
-            # Store server before clearing
-            server = self.server_id
-
+            # The state change refreshes the server's instance counts
             self.write({
                 'state': InstanceState.TERMINATED,
                 'status_message': 'Instance terminated',
                 'container_id': False,
             })
 
-            # Refresh server instance counts
-            if server:
-                server.refresh_instance_counts()
-
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
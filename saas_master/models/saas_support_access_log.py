@@ -21,6 +21,8 @@ class SaasSupportAccessLog(models.Model):
     _order = 'create_date desc'
     _rec_name = 'display_name'
 
+    _instance_user_access_idx = models.Index('(instance_id, accessed_by_id, access_time DESC NULLS LAST)')
+
     # Relations
     instance_id = fields.Many2one(
         ModelNames.INSTANCE,
@@ -25,6 +25,8 @@ class SaasSupportAccessRequest(models.Model):
     _order = 'create_date desc'
     _rec_name = 'display_name'
 
+    _pending_expiry_idx = models.Index('(token_expiry) WHERE state = \'pending\'')
+
     # Relations
     instance_id = fields.Many2one(
         ModelNames.INSTANCE,
@@ -82,6 +82,7 @@ class SaasSubscription(models.Model):
         string=FieldLabels.INSTANCE,
         tracking=True,
         ondelete='set null',
+        index='btree_not_null',
         help='Associated SaaS instance',
     )
     sale_order_id = fields.Many2one(